@@ -1,5 +1,6 @@
 import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from functools import reduce
@@ -10,6 +11,8 @@ from dou import logger
 from sqlalchemy import create_engine, text
 from tqdm import tqdm
 
+from db_utils import read_sql_copy
+
 load_dotenv()
 
 
@@ -19,8 +22,26 @@ def pdt(s):
 
 
 # Database connection setup
-engine = create_engine(os.getenv("DB_URL"))  # type: ignore
-conn = engine.connect()
+# Every query checks a connection out of the pool and returns it when done, so
+# concurrent tasks in one worker never share a connection and a broken
+# connection is replaced (pool_pre_ping) instead of poisoning later queries.
+# The gevent workers run many tasks per process, so they raise the pool size
+# through DB_POOL_SIZE / DB_MAX_OVERFLOW (see docker-compose.yml). Checkouts
+# beyond the pool wait for a free connection instead of failing after 30 s, as
+# a slow landuse or road query can hold its connection longer than that; no
+# caller holds one connection while waiting for another, so this cannot deadlock.
+engine = create_engine(
+    os.getenv("DB_URL"),  # type: ignore
+    pool_size=int(os.getenv("DB_POOL_SIZE", 8)),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 16)),
+    pool_timeout=None,
+    pool_pre_ping=True,
+)
+
+# Landuse codes queried at once by LanduseAreaCalculator. Kept well below the
+# pool size so one task never takes every connection from the other tasks in
+# the process (gevent greenlets or bundle threads).
+LANDUSE_MAX_WORKERS = 4
 
 
 class BorderType(Enum):
@@ -143,9 +164,7 @@ class RiverCalculator(BorderAbstractCalculator):
                 """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -244,9 +263,7 @@ class EmissionCalculator(BorderAbstractCalculator):
         """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -299,9 +316,7 @@ class CarRegistrationCalculator(BorderAbstractCalculator):
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -335,39 +350,53 @@ class LanduseAreaCalculator(BorderAbstractCalculator):
         year = self.year
         border_tbl = self.border_tbl
         border_cd = self.border_cd_col
-        border_nm = self.border_nm_col
         landuse_table = f"landuse_v002_{year}"
         codes = [110, 120, 130, 140, 150, 160, 200, 310, 320, 330, 400, 500, 600, 710]
 
-        df_list = []
-        for code in tqdm(codes, desc=f"({year}) landuse area/ratio calculation "):
-            area_col_name = f"lu_{code}_area"
-            ratio_col_name = f"lu_{code}_ratio"
+        # One statement for every code; only the :code bind parameter changes, so
+        # the SQL text stays identical across the loop and its plan can be reused.
+        sql = text(
+            f"""SELECT
+                b.{border_cd} AS {border_cd},
+                COALESCE(sum(ST_Area(ST_Intersection(l.geometry, b.geom))), 0) AS area,
+                COALESCE(sum(ST_Area(ST_Intersection(l.geometry, b.geom))), 0) / MAX(ST_Area(b.geom)) AS ratio
+            FROM
+                {border_tbl} AS b
+                LEFT JOIN {landuse_table} AS l
+                ON ST_Intersects(l.geometry, b.geom)
+                AND l.code = :code
+            GROUP BY
+                b.{border_cd}
+            """
+        )
 
-            sql = text(
-                f"""SELECT
-                    b.{border_cd} AS {border_cd},
-                    sum(ST_Area(ST_Intersection(l.geometry, b.geom))) AS {area_col_name},
-                    sum(ST_Area(ST_Intersection(l.geometry, b.geom))) / MAX(ST_Area(b.geom)) AS {ratio_col_name}
-                FROM
-                    {border_tbl} AS b
-                    LEFT JOIN {landuse_table} AS l 
-                    ON ST_Intersects(l.geometry, b.geom)
-                GROUP BY
-                    b.{border_cd}, 
-                """
-            )
-            try:
-                result = conn.execute(sql)
+        def run_code(code: int) -> pd.DataFrame:
+            # Each code runs on its own pooled connection so the queries overlap
+            # on the server instead of waiting on each other.
+            with engine.connect() as conn:
+                result = conn.execute(sql, {"code": code})
                 rows = result.all()
-                df = pd.DataFrame([dict(row._mapping) for row in rows])
-                df_list.append(df)
-            except Exception as e:
-                logger.error(f"Error in {self.__class__.__name__}: {e}")
-                raise
+                columns = list(result.keys())
+            df = pd.DataFrame(rows, columns=columns)
+            return df.rename(
+                columns={"area": f"lu_{code}_area", "ratio": f"lu_{code}_ratio"}
+            )
+
+        try:
+            with ThreadPoolExecutor(max_workers=LANDUSE_MAX_WORKERS) as executor:
+                df_list = list(
+                    tqdm(
+                        executor.map(run_code, codes),
+                        total=len(codes),
+                        desc=f"({year}) landuse area/ratio calculation ",
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
 
         df_merged = reduce(
-            lambda ldf, rdf: pd.merge(ldf, rdf, on=[border_cd, border_nm], how="outer"),
+            lambda ldf, rdf: pd.merge(ldf, rdf, on=border_cd, how="outer"),
             df_list,
         )
         return df_merged
@@ -407,7 +436,7 @@ class CoastlineDistanceCalculator(BorderAbstractCalculator):
             f"""
             SELECT
                 b.{border_cd} AS {border_cd},
-                ST_Distance(ST_Centroid(b.geom), ST_Transform(c.geom, 5179)) AS {self.label_prefix}
+                ST_Distance(ST_Centroid(b.geom), c.geom_5179) AS {self.label_prefix}
             FROM
                 {border_tbl} AS b, 
                 {self.table_name}_{year} AS c
@@ -415,9 +444,7 @@ class CoastlineDistanceCalculator(BorderAbstractCalculator):
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -452,7 +479,19 @@ class NdviCalculator(BorderAbstractCalculator):
         border_tbl = self.border_tbl
         border_cd = self.border_cd_col
         year = self.year
-        stat_types = ["count", "sum", "mean", "std", "min", "max"]
+        # output suffix -> ST_SummaryStats field
+        stat_fields = {
+            "count": "count",
+            "sum": "sum",
+            "mean": "mean",
+            "std": "stddev",
+            "min": "min",
+            "max": "max",
+        }
+        stat_columns = "".join(
+            f"\n                , stats.{field} AS {self.label_prefix}_{stat_type}"
+            for stat_type, field in stat_fields.items()
+        )
 
         sql = text(
             f"""
@@ -470,23 +509,15 @@ class NdviCalculator(BorderAbstractCalculator):
                     b.{border_cd}
             )
             SELECT
-                nm.{border_cd} AS {border_cd}
-                , ST_SummaryStats(nm.clipped_rast, 1, TRUE) AS stats
-            FROM ndvi_merged AS nm
+                nm.{border_cd} AS {border_cd}{stat_columns}
+            FROM
+                ndvi_merged AS nm
+                -- in FROM: one summary per border instead of one per field
+                CROSS JOIN LATERAL ST_SummaryStats(nm.clipped_rast, 1, TRUE) AS stats
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            df = pd.DataFrame([dict(row._mapping) for row in rows])
-
-            str2tuple = lambda x: x[1:-1].split(",")
-            for sti, stat_type in enumerate(stat_types):
-                df[f"{self.label_prefix}_{stat_type}"] = df["stats"].apply(
-                    lambda x: str2tuple(x)[sti]
-                )
-            df = df.drop(["stats"], axis=1)
-            return df
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -523,36 +554,27 @@ class AirportDistanceCalculator(BorderAbstractCalculator):
 
         sql = text(
             f"""
-            WITH airport_distance_tbl AS (
-                -- calculate distance between border centroid & airport 
-                SELECT
-                    b.{border_cd} AS {border_cd}
-                    , a.name AS airport_name
-                    , ST_Distance(ST_Centroid(b.geom), a.geometry) AS airport_distance
-                FROM
-                    {border_tbl} AS b
-                    CROSS JOIN airport AS a
-                WHERE a.year = {year}
-            ), airport_distance_rank_tbl AS (
-                -- calculate distance rank (minimum is 1)
-                SELECT 
-                    *
-                    ,  ROW_NUMBER() OVER (PARTITION BY ad.{border_cd} ORDER BY airport_distance ASC) AS distance_rank
-                FROM airport_distance_tbl AS ad
-            )
-            -- select minimum distance airport
-            SELECT 
-                {border_cd}
-                , airport_name
-                , airport_distance AS {self.label_prefix}
-            FROM airport_distance_rank_tbl
-            WHERE distance_rank = 1
+            -- nearest airport to each border centroid via a KNN lookup on the
+            -- airport GiST index instead of ranking every (border, airport) pair
+            SELECT
+                b.{border_cd} AS {border_cd}
+                , a.airport_name
+                , a.airport_distance AS {self.label_prefix}
+            FROM
+                {border_tbl} AS b
+                CROSS JOIN LATERAL (
+                    SELECT
+                        ap.name AS airport_name
+                        , ST_Distance(ST_Centroid(b.geom), ap.geometry) AS airport_distance
+                    FROM airport AS ap
+                    WHERE ap.year = {year}
+                    ORDER BY ap.geometry <-> ST_Centroid(b.geom)
+                    LIMIT 1
+                ) AS a
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -605,9 +627,7 @@ class MilitaryDemarcationLineDistanceCalculator(BorderAbstractCalculator):
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -672,9 +692,7 @@ class PortDistanceCalculator(BorderAbstractCalculator):
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -725,9 +743,7 @@ class RailCalculator(BorderAbstractCalculator):
                 """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -765,36 +781,37 @@ class RoadCalculator(BorderAbstractCalculator):
         if year == 2000:
             year = 2005
 
+        # Built once and bound per border rather than re-rendered inside the loop
+        sql = text(
+            f"""
+                WITH
+                    road_1year AS ( SELECT * FROM {self.table_name} WHERE year = :year )
+                    , border_sel AS ( SELECT * FROM {border_tbl} WHERE CAST({border_cd} AS BIGINT) = :border_cd )
+                SELECT
+                    bs.{border_cd} AS {border_cd}
+                    , COALESCE(SUM( ST_Length(ST_Intersection(r.geometry, bs.geom))), 0) AS {self.label_prefix}_length
+                FROM
+                    border_sel AS bs
+                    LEFT JOIN road_1year r ON ST_Intersects(bs.geom, r.geometry)
+                GROUP BY
+                    bs.{border_cd}
+            """
+        )
+
         try:
-            result = conn.execute(text(f"SELECT {border_cd} FROM {border_tbl}"))
-            border_id_df = pd.DataFrame([dict(row._mapping) for row in result.all()])
-            row_dict_list = []
-            for _, border_sr in tqdm(
-                border_id_df.iterrows(), total=len(border_id_df), disable=not verbose
-            ):
-                sel_border_cd = int(border_sr[border_cd])
-                # print(type(sel_border_cd), sel_border_cd)
-                sql = text(
-                    f"""
-                        WITH 
-                            road_1year AS ( SELECT * FROM {self.table_name} WHERE year = {year} )
-                            , border_sel AS ( SELECT * FROM {border_tbl} WHERE CAST({border_cd} AS BIGINT) = {sel_border_cd} ) 
-                        SELECT
-                            bs.{border_cd} AS {border_cd}
-                            , COALESCE(SUM( ST_Length(ST_Intersection(r.geometry, bs.geom))), 0) AS {self.label_prefix}_length
-                        FROM
-                            border_sel AS bs
-                            LEFT JOIN road_1year r ON ST_Intersects(bs.geom, r.geometry)
-                        GROUP BY
-                            bs.{border_cd}
-                    """
-                )
-                result = conn.execute(sql)
-                row_dict_list = row_dict_list + [
-                    dict(row._mapping) for row in result.all()
-                ]
+            with engine.connect() as conn:
+                result = conn.execute(text(f"SELECT {border_cd} FROM {border_tbl}"))
+                border_cds = result.scalars().all()
+                rows = []
+                for sel_border_cd in tqdm(border_cds, disable=not verbose):
+                    result = conn.execute(
+                        sql, {"year": year, "border_cd": int(sel_border_cd)}
+                    )
+                    rows.extend(result)
 
-            return pd.DataFrame(row_dict_list)
+            return pd.DataFrame(
+                rows, columns=[border_cd, f"{self.label_prefix}_length"]
+            )
 
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
@@ -830,8 +847,23 @@ class TopographicModelCalculator(BorderAbstractCalculator):
         border_tbl = self.border_tbl
         border_cd = self.border_cd_col
         year = self.year
-        stat_types = ["count", "sum", "mean", "std", "min", "max"]
+        # output suffix -> ST_SummaryStats field
+        stat_fields = {
+            "count": "count",
+            "sum": "sum",
+            "mean": "mean",
+            "std": "stddev",
+            "min": "min",
+            "max": "max",
+        }
         topo_types = ["dem", "dsm"]
+        stat_columns = {
+            topo_type: "".join(
+                f"\n                    , stats.{field} AS {topo_type}_{stat_type}"
+                for stat_type, field in stat_fields.items()
+            )
+            for topo_type in topo_types
+        }
 
         sql_dict = {
             topo_type: text(
@@ -849,27 +881,19 @@ class TopographicModelCalculator(BorderAbstractCalculator):
                         b.{border_cd}
                 )
                 SELECT
-                    {border_cd}
-                    , ST_SummaryStats(clipped_rast, 1, TRUE) AS stats
-                FROM 
-                    {topo_type}_merged
+                    tm.{border_cd} AS {border_cd}{stat_columns[topo_type]}
+                FROM
+                    {topo_type}_merged AS tm
+                    CROSS JOIN LATERAL ST_SummaryStats(tm.clipped_rast, 1, TRUE) AS stats
                 """
             )
             for topo_type in topo_types
         }
         try:
-            topo_df_dict = {}
-            for topo_type, sql in sql_dict.items():
-                result = conn.execute(sql)
-                rows = result.all()
-                df = pd.DataFrame([dict(row._mapping) for row in rows])
-                str2tuple = lambda x: x[1:-1].split(",")
-                for sti, stat_type in enumerate(stat_types):
-                    df[f"{topo_type}_{stat_type}"] = df["stats"].apply(
-                        lambda x: str2tuple(x)[sti]
-                    )
-                df = df.drop(["stats"], axis=1)
-                topo_df_dict[topo_type] = df
+            topo_df_dict = {
+                topo_type: read_sql_copy(engine, sql, dtype={border_cd: str})
+                for topo_type, sql in sql_dict.items()
+            }
 
             df = pd.merge(
                 topo_df_dict[topo_types[0]],
@@ -964,9 +988,11 @@ class RasterEmissionCalculator(BorderAbstractCalculator):
         try:
             df_list = []
             for matter in matter_alias.keys():
-                result = conn.execute(sql(matter))
-                rows = result.all()
-                df_list.append(pd.DataFrame([dict(row._mapping) for row in rows]))
+                with engine.connect() as conn:
+                    result = conn.execute(sql(matter))
+                    rows = result.all()
+                    columns = list(result.keys())
+                df_list.append(pd.DataFrame(rows, columns=columns))
 
             df_merged = reduce(
                 lambda ldf, rdf: pd.merge(ldf, rdf, on=[border_cd], how="outer"),
@@ -1032,9 +1058,7 @@ class ClinicBorderCalculator(BorderAbstractCalculator):
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -1098,9 +1122,7 @@ class HospitalBorderCalculator(BorderAbstractCalculator):
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={border_cd: str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
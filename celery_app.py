@@ -1,10 +1,43 @@
 import os
+import pickle
+import zlib
 
 from celery import Celery
 from dotenv import load_dotenv
+from kombu.serialization import register
 
 load_dotenv()
 
+# The calculator worker runs with `-P gevent`; Celery monkey-patches the stdlib
+# for that pool, but psycopg2 talks to the socket in C and needs its own wait
+# callback to yield to other greenlets while PostgreSQL is executing. With the
+# callback installed psycopg2 refuses COPY, so `db_utils.read_sql_copy` falls
+# back to a regular fetch in these workers. gevent and psycogreen come from the
+# `gevent` dependency group (`uv run --group gevent`).
+if os.getenv("CELERY_WORKER_POOL") == "gevent":
+    from psycogreen.gevent import patch_psycopg
+
+    patch_psycopg()
+
+
+def _zpickle_dumps(obj) -> bytes:
+    # Level 1 costs about as much as the pickling itself and shrinks the long
+    # runs of same-keyed records returned by the CSV tasks roughly fourfold
+    return zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _zpickle_loads(data: bytes):
+    return pickle.loads(zlib.decompress(data))
+
+
+register(
+    "zpickle",
+    _zpickle_dumps,
+    _zpickle_loads,
+    content_type="application/x-zpickle",
+    content_encoding="binary",
+)
+
 # Configure Celery
 celery_app = Celery(
     "tasks",
@@ -17,7 +50,12 @@ celery_app = Celery(
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],  # Ignore other content
-    result_serializer="json",
+    # Calculation results are DataFrames; pickle keeps them columnar on the backend.
+    # Unpickling runs arbitrary code, and the API and workers unpickle whatever
+    # sits in the result backend (and the calculation cache in tasks.py), so Redis
+    # must be trusted and network-isolated: never reachable by untrusted clients.
+    result_serializer="zpickle",
+    result_accept_content=["json", "zpickle"],
     timezone="Asia/Seoul",
     enable_utc=True,
 )
@@ -0,0 +1,38 @@
+import pytest
+import shapely
+
+import point_based_calculations as pbc
+
+
+class FakeConnection:
+    """Connection returning fixed WKB rows for the feature tree query."""
+
+    def __init__(self, geometries):
+        self.geometries = geometries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return [shapely.to_wkb(geometry) for geometry in self.geometries]
+
+
+@pytest.fixture
+def features(monkeypatch):
+    """Serve the given geometries as the feature table of the STRtree lookup."""
+
+    def use(geometries):
+        monkeypatch.setattr(pbc.engine, "connect", lambda: FakeConnection(geometries))
+
+    pbc._load_feature_tree.cache_clear()
+    yield use
+    pbc._load_feature_tree.cache_clear()
@@ -0,0 +1,45 @@
+import io
+
+import pandas as pd
+from psycopg2.extensions import get_wait_callback
+from sqlalchemy import Engine, TextClause
+
+
+def read_sql_copy(
+    engine: Engine, sql: TextClause, dtype: dict | None = None
+) -> pd.DataFrame:
+    """
+    Read a query into a DataFrame with `COPY ... TO STDOUT`.
+
+    PostgreSQL streams the result as CSV and pandas parses it with its C reader,
+    so no Python object is created per row or per cell on the way in.
+
+    psycopg2 refuses COPY while a wait callback is installed, which is the case
+    in the gevent workers (psycogreen, see celery_app.py); there the query is
+    read with a regular cursor fetch instead.
+
+    Args:
+        engine: Engine to check the connection out of
+        sql: SQL statement without bind parameters
+        dtype: Column dtypes of the result; code columns must be read
+            as `str` to keep their leading zeros
+
+    Returns:
+        DataFrame containing the query results
+    """
+    if get_wait_callback() is not None:
+        with engine.connect() as conn:
+            return pd.read_sql(sql, conn, dtype=dtype)
+
+    query = str(sql).strip().rstrip(";")
+    buffer = io.BytesIO()
+    with engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY ({query}) TO STDOUT WITH (FORMAT CSV, HEADER)", buffer
+            )
+        finally:
+            cursor.close()
+    buffer.seek(0)
+    return pd.read_csv(buffer, dtype=dtype)
@@ -1,5 +1,6 @@
 import os
 
+import pandas as pd
 from celery.result import AsyncResult
 from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, File, Form, HTTPException, Security, UploadFile
@@ -41,6 +42,14 @@ async def get_api_key(api_key_header: str = Security(api_key_header)):
     raise HTTPException(status_code=403, detail="Invalid API Key")
 
 
+def dataframe_to_records(df: pd.DataFrame) -> list[dict]:
+    """Convert a task result to JSON-ready records, with missing values as null.
+
+    Outer merges leave NaN in the frames, which the JSON response rejects.
+    """
+    return df.astype(object).where(df.notna(), None).to_dict(orient="records")
+
+
 # --- Status Check Endpoint ---
 @app.get("/job_status/", dependencies=[Depends(get_api_key)])
 def get_job_status(task_id: str):
@@ -55,7 +64,18 @@ def get_job_status(task_id: str):
     }
 
     if task_result.successful():
-        response["result"] = task_result.get()
+        result = task_result.get()
+        if isinstance(result, pd.DataFrame):
+            result = dataframe_to_records(result)
+        elif isinstance(result, dict):
+            # Bundle tasks return one result per variable
+            result = {
+                key: dataframe_to_records(value)
+                if isinstance(value, pd.DataFrame)
+                else value
+                for key, value in result.items()
+            }
+        response["result"] = result
     elif task_result.failed():
         try:
             error_info = (
@@ -163,6 +183,41 @@ def border_hospital_count(border_type: BorderType, year: int):
     return {"task_id": task.id}
 
 
+@app.post("/border/all/", dependencies=[Depends(get_api_key)])
+def border_all(border_type: BorderType, year: int):
+    """Calculate every border variable valid for `year` in one merged table."""
+    try:
+        result = tasks.dispatch_all_border(border_type.value, year)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"task_id": result.id}
+
+
+class BorderBundleRequest(BaseModel):
+    border_type: BorderType
+    year: int
+    kinds: list[str]
+
+
+@app.post("/border/bundle/", dependencies=[Depends(get_api_key)])
+def border_bundle(request: BorderBundleRequest):
+    """Calculate several border variables in one job.
+
+    `kinds` takes the variable names of the single-variable border endpoints,
+    e.g. ["river", "road", "ndvi"]. The job result maps each name to its rows.
+    """
+    unknown = [kind for kind in request.kinds if kind not in tasks.BORDER_CALCULATORS]
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown border variables: {', '.join(unknown)}"
+        )
+
+    task = tasks.calculate_border_bundle_task.delay(
+        request.border_type.value, request.year, request.kinds
+    )
+    return {"task_id": task.id}
+
+
 class PointCalculationRequest(BaseModel):
     coordinates: list[list[float]]
     buffer_size: int
@@ -170,6 +225,12 @@ class PointCalculationRequest(BaseModel):
     srid: int = 4326
 
 
+class PointDistanceRequest(BaseModel):
+    coordinates: list[list[float]]
+    year: int
+    srid: int = 4326
+
+
 class CSVCalculationRequest(BaseModel):
     file_id: str
     calculator_type: str
@@ -204,6 +265,19 @@ def point_hospital(request: PointCalculationRequest):
     return {"task_id": task.id}
 
 
+@app.post("/point/airport_distance/", dependencies=[Depends(get_api_key)])
+def point_airport_distance(request: PointDistanceRequest):
+    """Calculate the distance to the nearest airport for given coordinates.
+
+    Example coordinates: [129.049088, 37.094144] (longitude, latitude in WGS84)
+    Default SRID: 4326 (WGS84)
+    """
+    task = tasks.calculate_point_airport_distance_task.delay(
+        request.coordinates, request.year, request.srid
+    )
+    return {"task_id": task.id}
+
+
 @app.post("/csv/calculate/", dependencies=[Depends(get_api_key)])
 def csv_calculate(request: CSVCalculationRequest):
     """Process entire CSV file for point-based calculations.
@@ -211,6 +285,8 @@ def csv_calculate(request: CSVCalculationRequest):
     CSV should contain 'x' and 'y' columns with coordinates.
     Example coordinates: x=129.049088, y=37.094144 (longitude, latitude in WGS84)
     Default SRID: 4326 (WGS84)
+    calculator_type: "bus_stop", "hospital" or "airport" (buffer_size is ignored
+    for "airport")
     """
     task = tasks.calculate_csv_file_task.delay(
         request.file_id,
@@ -235,6 +311,8 @@ def csv_calculate_direct_upload(
     CSV should contain 'x' and 'y' columns with coordinates.
     Example coordinates: x=129.049088, y=37.094144 (longitude, latitude in WGS84)
     Default SRID: 4326 (WGS84)
+    calculator_type: "bus_stop", "hospital" or "airport" (buffer_size is ignored
+    for "airport")
     """
 
     if file.content_type != "text/csv" or not (
@@ -1,19 +1,76 @@
 import os
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterator
 from enum import Enum
-from typing import Literal
+from functools import lru_cache
+from typing import TYPE_CHECKING, Literal
 
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
 from dou import logger
-from sqlalchemy import create_engine, text
-from tqdm import tqdm
+from sqlalchemy import TextClause, create_engine, text
+
+from db_utils import read_sql_copy
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from pyproj import Transformer
+    from shapely import STRtree
 
 load_dotenv()
 
 # Database connection setup
-engine = create_engine(os.getenv("DB_URL"))  # type: ignore
-conn = engine.connect()
+# Connections are checked out of the engine pool per query rather than sharing
+# one module-level connection, so concurrent tasks (threads or gevent greenlets)
+# in the same worker never interleave statements on a single connection.
+# The gevent workers run many tasks per process, so they raise the pool size
+# through DB_POOL_SIZE / DB_MAX_OVERFLOW (see docker-compose.yml). Checkouts
+# beyond the pool wait for a free connection instead of failing after 30 s, as
+# a slow landuse or road query can hold its connection longer than that; no
+# caller holds one connection while waiting for another, so this cannot deadlock.
+engine = create_engine(
+    os.getenv("DB_URL"),  # type: ignore
+    pool_size=int(os.getenv("DB_POOL_SIZE", 8)),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", 16)),
+    pool_timeout=None,
+    pool_pre_ping=True,
+)
+
+
+@lru_cache(maxsize=1024)
+def _cached_text(sql: str) -> TextClause:
+    """
+    Build a `text()` clause once per distinct SQL string.
+
+    Calculators render their SQL from a small set of tables, years and buffer
+    sizes, so sweeps over many instances keep producing the same strings. Reusing
+    the clause skips the bind parameter scan in `text()` and lets SQLAlchemy hit
+    its compiled cache for the same object.
+
+    Args:
+        sql: Rendered SQL string
+
+    Returns:
+        Shared TextClause for the SQL string
+    """
+    return text(sql)
+
+
+@lru_cache(maxsize=1)
+def _get_tot_reg_cds() -> tuple[str, ...]:
+    """
+    Fetch all jgg centroid codes once per process.
+
+    Returns:
+        Sorted tot_reg_cd values of jgg_centroid_adjusted
+    """
+    sql = text("SELECT tot_reg_cd FROM jgg_centroid_adjusted ORDER BY tot_reg_cd")
+    with engine.connect() as conn:
+        result = conn.execute(sql)
+        return tuple(row.tot_reg_cd for row in result)
 
 
 class BufferSize(Enum):
@@ -98,7 +155,19 @@ class PointAbstractCalculator(ABC):
         """List of valid years for this calculator."""
         pass
 
-    @abstractmethod
+    def build_sql(self) -> TextClause:
+        """
+        Build the query for the point-based calculation.
+
+        Calculators that need more than one query override `calculate` instead.
+
+        Returns:
+            SQL statement returning calculation results
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not build a single SQL statement"
+        )
+
     def calculate(self) -> pd.DataFrame:
         """
         Execute the point-based calculation.
@@ -106,7 +175,72 @@ class PointAbstractCalculator(ABC):
         Returns:
             DataFrame containing calculation results
         """
-        pass
+        batches = list(self.calculate_batches())
+        if not batches:
+            return pd.DataFrame()
+        return pd.concat(batches, ignore_index=True)
+
+    def calculate_batches(self, batch_size: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Execute the point-based calculation and yield results in chunks.
+
+        Rows are streamed with a server-side cursor, so at most `batch_size`
+        rows are held in Python at a time. Use this for large raster results,
+        e.g. `for chunk in calculator.calculate_batches(): sink.write(chunk)`.
+
+        Args:
+            batch_size: Number of rows per yielded DataFrame
+
+        Yields:
+            DataFrame containing a chunk of calculation results
+        """
+        sql = self.build_sql()
+        try:
+            with engine.connect() as conn:
+                result = conn.execute(
+                    sql,
+                    execution_options={"stream_results": True, "yield_per": batch_size},
+                )
+                columns = list(result.keys())
+                for rows in result.partitions(batch_size):
+                    yield pd.DataFrame(rows, columns=columns)
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
+
+    def calculate_arrow(self) -> "pa.Table":
+        """
+        Execute the point-based calculation and return an Arrow table.
+
+        The result is read with connectorx, which fills Arrow buffers directly
+        from the database instead of building a Python object per row. Convert
+        to pandas only at the export boundary, e.g.
+        `table.to_pandas(types_mapper=pd.ArrowDtype)`.
+
+        Returns:
+            Arrow table containing calculation results
+
+        Raises:
+            ImportError: If connectorx is not installed
+        """
+        try:
+            import connectorx as cx
+        except ImportError as e:
+            raise ImportError(
+                "calculate_arrow requires connectorx: `uv add connectorx pyarrow`"
+            ) from e
+
+        sql = self.build_sql()
+        db_url = engine.url.set(drivername="postgresql")
+        try:
+            return cx.read_sql(
+                db_url.render_as_string(hide_password=False),
+                str(sql),
+                return_type="arrow",
+            )
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
 
     def validate_year(self) -> None:
         """
@@ -128,12 +262,12 @@ class JggCentroidRasterValueCalculator(PointAbstractCalculator):
     def __init__(self):
         pass
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation.
+        Build the query for the point-based calculation.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         if self.table_name == "dem":
             column_name = "Altitude_k"
@@ -142,20 +276,14 @@ class JggCentroidRasterValueCalculator(PointAbstractCalculator):
         else:
             raise ValueError(f"Invalid table name: {self.table_name}")
 
-        sql = text(
+        sql = _cached_text(
             f"""SELECT src.tot_reg_cd, ST_Value(dst.rast, 1, src.geom) AS "{column_name}"
             FROM jgg_centroid_adjusted AS src, {self.table_name} AS dst
             WHERE ST_Intersects(src.geom, dst.rast)
             ORDER BY src.tot_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class DemRasterValueCalculator(JggCentroidRasterValueCalculator):
@@ -197,17 +325,17 @@ class JggCentroidBufferCountCalculator(PointAbstractCalculator):
         super().__init__(year)
         self.buffer_size = buffer_size
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation.
+        Build the query for the point-based calculation.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = f"{self.label_prefix}_{str(self.buffer_size.value).zfill(4)}"
 
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 jb.tot_reg_cd,
@@ -222,13 +350,7 @@ class JggCentroidBufferCountCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class BusStopCountCalculator(JggCentroidBufferCountCalculator):
@@ -297,12 +419,12 @@ class ClinicCountCalculator(PointAbstractCalculator):
         # Assuming these are the relevant years, adjust if needed
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation for clinic counts based on existence in the given year.
+        Build the query for the point-based calculation for clinic counts based on existence in the given year.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = (
@@ -310,7 +432,7 @@ class ClinicCountCalculator(PointAbstractCalculator):
         )
 
         # Modified SQL to check if the clinic existed in the given year
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 jb.tot_reg_cd,
@@ -328,13 +450,7 @@ class ClinicCountCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class HospitalCountCalculator(PointAbstractCalculator):
@@ -365,12 +481,12 @@ class HospitalCountCalculator(PointAbstractCalculator):
         # Assuming these are the relevant years, adjust if needed
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation for hospital counts based on existence in the given year.
+        Build the query for the point-based calculation for hospital counts based on existence in the given year.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = (
@@ -378,7 +494,7 @@ class HospitalCountCalculator(PointAbstractCalculator):
         )
 
         # Modified SQL to check if the hospital existed in the given year
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 jb.tot_reg_cd,
@@ -396,13 +512,7 @@ class HospitalCountCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class JggCentroidShortestDistanceCalculator(PointAbstractCalculator):
@@ -417,38 +527,43 @@ class JggCentroidShortestDistanceCalculator(PointAbstractCalculator):
         """
         self.year = year
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation.
+        Build the query for the point-based calculation.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = f"{self.label_prefix}_{self.year}"
 
-        sql = text(
+        # KNN: `<->` walks the GiST index on dst.geometry (see
+        # `scripts/nearest_distance_indexes.sql`) to the nearest feature per
+        # centroid instead of measuring the distance to every feature.
+        sql = _cached_text(
             f"""
             SELECT
                 src.tot_reg_cd,
-                min(ST_Distance(src.geom, dst.geometry)) AS "{column_name}"
+                nearest.distance AS "{column_name}"
             FROM
                 public.jgg_centroid_adjusted AS src
-                JOIN public."{self.table_name}" AS dst ON dst.year = {self.year}
-            GROUP BY
-                src.tot_reg_cd
+                CROSS JOIN LATERAL (
+                    SELECT
+                        ST_Distance(src.geom, dst.geometry) AS distance
+                    FROM
+                        public."{self.table_name}" AS dst
+                    WHERE
+                        dst.year = {self.year}
+                    ORDER BY
+                        dst.geometry <-> src.geom
+                    LIMIT 1
+                ) AS nearest
             ORDER BY
                 src.tot_reg_cd;
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class BusStopDistanceCalculator(JggCentroidShortestDistanceCalculator):
@@ -686,18 +801,18 @@ class ClinicDistanceCalculator(JggCentroidShortestDistanceCalculator):
         # Assuming these are the relevant years, adjust if needed
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation for shortest distance to the nearest clinic.
+        Build the query for the point-based calculation for shortest distance to the nearest clinic.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = f"{self.label_prefix}_{self.year}"
 
         # Modified SQL to find the minimum distance to clinics existing in the given year
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 src.tot_reg_cd,
@@ -715,13 +830,7 @@ class ClinicDistanceCalculator(JggCentroidShortestDistanceCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class HospitalDistanceCalculator(JggCentroidShortestDistanceCalculator):
@@ -741,18 +850,18 @@ class HospitalDistanceCalculator(JggCentroidShortestDistanceCalculator):
         # Assuming these are the relevant years, adjust if needed
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation for shortest distance to the nearest hospital.
+        Build the query for the point-based calculation for shortest distance to the nearest hospital.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = f"{self.label_prefix}_{self.year}"
 
         # Modified SQL to find the minimum distance to hospitals existing in the given year
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 src.tot_reg_cd,
@@ -770,13 +879,7 @@ class HospitalDistanceCalculator(JggCentroidShortestDistanceCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class CarMeanCalculator(PointAbstractCalculator):
@@ -795,16 +898,16 @@ class CarMeanCalculator(PointAbstractCalculator):
         """List of valid years for this calculator."""
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the point-based calculation.
+        Build the query for the point-based calculation.
 
         Returns:
-            DataFrame containing calculation results
+            SQL statement returning calculation results
         """
         self.validate_year()
         column_name = self.label_prefix
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 a.tot_reg_cd,
@@ -818,13 +921,7 @@ class CarMeanCalculator(PointAbstractCalculator):
                 a.tot_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class BusinessRegistrationCountCalculator(PointAbstractCalculator):
@@ -854,12 +951,12 @@ class BusinessRegistrationCountCalculator(PointAbstractCalculator):
         """Return list of valid years for business registration data."""
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the business registration count calculation with buffer zones.
+        Build the query for the business registration count calculation with buffer zones.
 
         Returns:
-            DataFrame containing calculation results with business registration count variables
+            SQL statement returning calculation results with business registration count variables
         """
         self.validate_year()
         buffer_value = self.buffer_size.value
@@ -881,7 +978,7 @@ class BusinessRegistrationCountCalculator(PointAbstractCalculator):
 
         column_expr = ",\n    ".join(bnu_columns)
 
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 ia.center_reg_cd as tot_reg_cd,
@@ -899,13 +996,7 @@ class BusinessRegistrationCountCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class BusinessEmployeeCountCalculator(PointAbstractCalculator):
@@ -935,12 +1026,12 @@ class BusinessEmployeeCountCalculator(PointAbstractCalculator):
         """Return list of valid years for business employee data."""
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the business Employee count calculation with buffer zones.
+        Build the query for the business Employee count calculation with buffer zones.
 
         Returns:
-            DataFrame containing calculation results with business employee count variables
+            SQL statement returning calculation results with business employee count variables
         """
         self.validate_year()
         buffer_value = self.buffer_size.value
@@ -962,7 +1053,7 @@ class BusinessEmployeeCountCalculator(PointAbstractCalculator):
 
         column_expr = ",\n    ".join(bem_columns)
 
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 ia.center_reg_cd as tot_reg_cd,
@@ -980,13 +1071,7 @@ class BusinessEmployeeCountCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class HouseTypeCountCalculator(PointAbstractCalculator):
@@ -1016,12 +1101,12 @@ class HouseTypeCountCalculator(PointAbstractCalculator):
         """Return list of valid years for house type data."""
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the house type count calculation with buffer zones.
+        Build the query for the house type count calculation with buffer zones.
 
         Returns:
-            DataFrame containing calculation results with house type count variables
+            SQL statement returning calculation results with house type count variables
         """
         self.validate_year()
         buffer_value = self.buffer_size.value
@@ -1043,7 +1128,7 @@ class HouseTypeCountCalculator(PointAbstractCalculator):
 
         column_expr = ",\n    ".join(gb_columns)
 
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT
                 ia.center_reg_cd as tot_reg_cd,
@@ -1061,13 +1146,7 @@ class HouseTypeCountCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class EmissionVectorBasedCalculator(PointAbstractCalculator):
@@ -1089,19 +1168,19 @@ class EmissionVectorBasedCalculator(PointAbstractCalculator):
     def valid_years(self) -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the emission calculation.
+        Build the query for the emission calculation.
 
         Returns:
-            DataFrame containing calculation results with emission variables
+            SQL statement returning calculation results with emission variables
         """
         self.validate_year()
         buffer = self.buffer_size.value
         emission_year = self.year
         label_postfix = str(self.buffer_size.value).zfill(5)
 
-        sql = text(
+        sql = _cached_text(
             f"""
                 WITH tmp AS (
                     SELECT
@@ -1197,12 +1276,114 @@ class EmissionVectorBasedCalculator(PointAbstractCalculator):
                     tot_reg_cd;
                     """
         )
+        return sql
+
+    @classmethod
+    def calculate_multi(
+        cls, buffer_sizes: list[EmissionBufferSize], year: int
+    ) -> pd.DataFrame:
+        """
+        Execute the emission calculation for several buffer sizes in one query.
+
+        The emission tables are joined once against the largest buffer and each
+        buffer size becomes a conditional sum, so the spatial join is shared by
+        every buffer instead of being repeated per buffer size.
+
+        Args:
+            buffer_sizes: Buffer sizes to calculate
+            year: Reference year for the calculation
+
+        Returns:
+            DataFrame containing one emission column per pollutant and buffer size
+        """
+        if not buffer_sizes:
+            raise ValueError("No buffer sizes provided")
+
+        calculator = cls(buffer_sizes[0], year)
+        calculator.validate_year()
+        label = calculator.label_prefix
+        max_buffer = max(b.value for b in buffer_sizes)
+        matter_alias = {
+            "co": "CO",
+            "nox": "NOx",
+            "nh3": "NH3",
+            "voc": "VOC",
+            "pm10": "PM10",
+            "sox": "SOx",
+            "tsp": "TSP",
+        }
+
+        # ST_DFullyWithin keeps the containment semantics of
+        # ST_Contains(ST_Buffer(a.geom, buffer), b.geometry) used by calculate().
+        # It is evaluated once per (centroid, feature) pair and buffer size in the
+        # lateral subquery; the sums only read the resulting flags.
+        matters = ", ".join(f"b.{m}" for m in matter_alias)
+        flags = ",\n".join(
+            f"ST_DFullyWithin(a.geom, b.geometry, {b.value}) AS within_{b.value}"
+            for b in buffer_sizes
+        )
+        sums = ",\n".join(
+            f"COALESCE(SUM(CASE WHEN e.within_{b.value} THEN e.{m} ELSE 0 END), 0)"
+            f" AS {m}_{b.value}"
+            for b in buffer_sizes
+            for m in matter_alias
+        )
+
+        def table_sql(table: str) -> str:
+            return f"""
+                SELECT
+                    a.tot_reg_cd,
+                    {sums}
+                FROM
+                    "jgg_centroid_adjusted" AS a
+                LEFT JOIN LATERAL (
+                    SELECT
+                        {matters},
+                        {flags}
+                    FROM
+                        {table} AS b
+                    WHERE
+                        ST_DWithin(a.geom, b.geometry, {max_buffer})
+                        AND b.year = {year}
+                    -- Keeps the planner from pulling the subquery up and copying
+                    -- the flag expressions back into every sum
+                    OFFSET 0
+                ) AS e ON true
+                GROUP BY
+                    a.tot_reg_cd
+                """
+
+        union_sql = "\nUNION ALL\n".join(
+            table_sql(table) for table in calculator.table_name
+        )
+        columns = ",\n".join(
+            f'sum({m}_{b.value}) AS "{label}_{M}_{str(b.value).zfill(5)}"'
+            for b in buffer_sizes
+            for m, M in matter_alias.items()
+        )
+
+        sql = _cached_text(
+            f"""
+            WITH tmp AS (
+                {union_sql}
+            )
+            SELECT
+                tmp.tot_reg_cd,
+                {columns}
+            FROM
+                tmp
+            GROUP BY
+                tot_reg_cd;
+            """
+        )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            with engine.connect() as conn:
+                result = conn.execute(sql)
+                rows = result.all()
+                columns = list(result.keys())
+            return pd.DataFrame(rows, columns=columns)
         except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            logger.error(f"Error in {cls.__name__}: {e}")
             raise
 
 
@@ -1270,12 +1451,12 @@ class EmissionRasterValueCalculator(PointAbstractCalculator):
                 f"Invalid pollutant type '{self.pollutant_type}'. Valid types are: {valid_types_str}"
             )
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         """
-        Execute the emission raster value calculation.
+        Build the query for the emission raster value calculation.
 
         Returns:
-            DataFrame containing calculation results with emission raster values
+            SQL statement returning calculation results with emission raster values
         """
         self.validate_year()
         self.validate_emission_type()
@@ -1283,7 +1464,7 @@ class EmissionRasterValueCalculator(PointAbstractCalculator):
 
         column_name = f"{self.label_prefix}_{self.emission_type}_{self.pollutant_type}_{self.year}"
 
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT src.tot_reg_cd,
                    ST_Value(dst.rast, 1, src.geom) AS "{column_name}"
@@ -1297,20 +1478,18 @@ class EmissionRasterValueCalculator(PointAbstractCalculator):
             """
         )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class CustomPointAbstractCalculator(ABC):
     """Base class for point-based calculations with custom coordinates."""
 
     def __init__(
-        self, year: int, coordinates: list[tuple[float, float]], srid: int = 4326
+        self,
+        year: int,
+        coordinates: list[tuple[float, float]],
+        srid: int = 4326,
+        first_point_id: int = 1,
     ):
         """
         Initialize calculator with year, coordinates, and SRID.
@@ -1319,10 +1498,13 @@ class CustomPointAbstractCalculator(ABC):
             year: Reference year for the calculation
             coordinates: List of (x, y) coordinate tuples
             srid: Spatial Reference System Identifier (default: 4326 for WGS84)
+            first_point_id: `point_id` of the first coordinate; batched callers
+                pass their offset so ids run on across batches
         """
         self.year = year
         self.coordinates = coordinates
         self.srid = srid
+        self.first_point_id = first_point_id
 
     @property
     @abstractmethod
@@ -1343,6 +1525,18 @@ class CustomPointAbstractCalculator(ABC):
         pass
 
     @abstractmethod
+    def records(self) -> list[dict]:
+        """
+        Execute the point-based calculation and return rows as dicts.
+
+        The rows are built straight from the cursor, so callers that only need
+        serializable results (the Celery tasks) never construct a DataFrame.
+
+        Returns:
+            List of result rows, one per coordinate
+        """
+        pass
+
     def calculate(self) -> pd.DataFrame:
         """
         Execute the point-based calculation.
@@ -1350,7 +1544,7 @@ class CustomPointAbstractCalculator(ABC):
         Returns:
             DataFrame containing calculation results
         """
-        pass
+        return pd.DataFrame(self.records())
 
     def validate_year(self) -> None:
         """
@@ -1375,60 +1569,115 @@ class CustomPointBufferCountCalculator(CustomPointAbstractCalculator):
         year: int,
         coordinates: list[tuple[float, float]],
         srid: int = 4326,
+        first_point_id: int = 1,
     ):
-        super().__init__(year, coordinates, srid)
+        super().__init__(year, coordinates, srid, first_point_id)
         self.buffer_size = buffer_size
 
-    def calculate(self) -> pd.DataFrame:
+    def records(self) -> list[dict]:
         """
         Execute the point-based calculation for custom coordinates.
 
         Returns:
-            DataFrame containing calculation results
+            List of result rows, one per coordinate
         """
         self.validate_year()
         column_name = f"{self.label_prefix}_{str(self.buffer_size.value).zfill(4)}"
 
-        results = []
-        for i, (x, y) in enumerate(self.coordinates):
-            _i = i + 1
-            # Transform coordinates if not in EPSG:5179 (Korean coordinate system)
-            if self.srid != 5179:
-                transform_clause = f"ST_Transform(ST_SetSRID(ST_MakePoint({x}, {y}), {self.srid}), 5179)"
-            else:
-                transform_clause = f"ST_SetSRID(ST_MakePoint({x}, {y}), 5179)"
+        return self._count_within_buffer(
+            column_name, "geometry", f"t.year = {self.year}"
+        )
 
-            sql = text(
-                f"""
+    def _count_within_buffer(
+        self, column_name: str, geometry_column: str, condition: str
+    ) -> list[dict]:
+        """
+        Count features within the buffer of every coordinate in one query.
+
+        The distinct coordinates are sent as arrays and unnested on the server;
+        repeated coordinates share one result. The bounding box of the whole
+        batch, expanded by the buffer size, is used as an index-only `&&`
+        pre-filter so the GiST index skips features that are far from every
+        point before the per-point ST_DWithin check. The points are transformed
+        once in a MATERIALIZED CTE shared by the bounding box and the join.
+
+        Args:
+            column_name: Name of the count column
+            geometry_column: Geometry column of the counted table
+            condition: Additional join condition on the counted table `t`
+
+        Returns:
+            List of result rows, one per coordinate
+        """
+        if not self.coordinates:
+            return []
+
+        # Transform coordinates if not in EPSG:5179 (Korean coordinate system)
+        if self.srid != 5179:
+            transform_clause = (
+                f"ST_Transform(ST_SetSRID(ST_MakePoint(p.x, p.y), {self.srid}), 5179)"
+            )
+        else:
+            transform_clause = "ST_SetSRID(ST_MakePoint(p.x, p.y), 5179)"
+
+        sql = _cached_text(
+            f"""
+            WITH pts_geom AS MATERIALIZED (
                 SELECT
-                    {_i} as point_id,
-                    {x} as x,
-                    {y} as y,
-                    COUNT(t.*) as "{column_name}"
+                    p.point_id,
+                    p.x,
+                    p.y,
+                    {transform_clause} AS geom
                 FROM
-                    public.{self.table_name} t
-                WHERE
-                    ST_DWithin(
-                        {transform_clause},
-                        t.geometry,
-                        {self.buffer_size.value}
-                    )
-                    AND t.year = {self.year}
-                """
+                    unnest(CAST(:xs AS float8[]), CAST(:ys AS float8[]))
+                        WITH ORDINALITY AS p(x, y, point_id)
+            ),
+            env AS (
+                SELECT
+                    ST_SetSRID(ST_Expand(ST_Extent(geom), {self.buffer_size.value})::geometry, 5179) AS bbox
+                FROM
+                    pts_geom
             )
+            SELECT
+                p.point_id,
+                p.x,
+                p.y,
+                COUNT(t.*) as "{column_name}"
+            FROM
+                pts_geom p
+                LEFT JOIN public.{self.table_name} t
+                    ON t.{geometry_column} && (SELECT bbox FROM env)
+                    AND ST_DWithin(p.geom, t.{geometry_column}, {self.buffer_size.value})
+                    AND {condition}
+            GROUP BY
+                p.point_id, p.x, p.y
+            ORDER BY
+                p.point_id;
+            """
+        )
 
-            try:
-                result = conn.execute(sql)
-                rows = result.all()
-                if rows:
-                    results.extend([dict(row._mapping) for row in rows])
-                else:
-                    results.append({"point_id": _i, "x": x, "y": y, column_name: 0})
-            except Exception as e:
-                logger.error(f"Error in {self.__class__.__name__} for point {_i}: {e}")
-                results.append({"point_id": _i, "x": x, "y": y, column_name: 0})
+        points = [(float(x), float(y)) for x, y in self.coordinates]
+        unique_points = list(dict.fromkeys(points))
 
-        return pd.DataFrame(results)
+        try:
+            with engine.connect() as conn:
+                result = conn.execute(
+                    sql,
+                    {
+                        "xs": [x for x, _ in unique_points],
+                        "ys": [y for _, y in unique_points],
+                    },
+                )
+                counts = {
+                    unique_points[p_id - 1]: count for p_id, _, _, count in result
+                }
+            return [
+                {"point_id": p_id, "x": x, "y": y, column_name: counts[(x, y)]}
+                for p_id, (x, y) in enumerate(points, start=self.first_point_id)
+            ]
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
 
 
 class CustomBusStopCountCalculator(CustomPointBufferCountCalculator):
@@ -1462,59 +1711,241 @@ class CustomHospitalCountCalculator(CustomPointBufferCountCalculator):
     def valid_years(self) -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def records(self) -> list[dict]:
         """
         Execute the point-based calculation for hospital counts with date filtering.
 
         Returns:
-            DataFrame containing calculation results
+            List of result rows, one per coordinate
         """
         self.validate_year()
         column_name = (
             f"{self.label_prefix}_{self.year}_{str(self.buffer_size.value).zfill(4)}"
         )
 
-        results = []
-        for i, (x, y) in enumerate(self.coordinates):
-            _i = i + 1
-            # Transform coordinates if not in EPSG:5179 (Korean coordinate system)
-            if self.srid != 5179:
-                transform_clause = f"ST_Transform(ST_SetSRID(ST_MakePoint({x}, {y}), {self.srid}), 5179)"
-            else:
-                transform_clause = f"ST_SetSRID(ST_MakePoint({x}, {y}), 5179)"
+        return self._count_within_buffer(
+            column_name,
+            "geom",
+            f"""CAST(SUBSTRING(t.date, 1, 4) AS INTEGER) <= {self.year}
+                    AND (t.date_c IS NULL OR CAST(SUBSTRING(t.date_c, 1, 4) AS INTEGER) >= {self.year})""",
+        )
 
-            sql = text(
-                f"""
-                SELECT
-                    {_i} as point_id,
-                    {x} as x,
-                    {y} as y,
-                    COUNT(t.*) as "{column_name}"
-                FROM
-                    public.{self.table_name} t
-                WHERE
-                    ST_DWithin(
-                        {transform_clause},
-                        t.geom,
-                        {self.buffer_size.value}
+
+# Nearest-feature lookup for custom points. Only the table name is formatted in,
+# so every request against the same table reuses one cached, compiled statement;
+# ST_Transform is a no-op when the input SRID is already 5179. pts_geom is
+# MATERIALIZED so each point is transformed exactly once; a CTE referenced once
+# would otherwise be inlined into the lateral lookup.
+_NEAREST_FEATURE_SQL = """
+    WITH pts_geom AS MATERIALIZED (
+        SELECT
+            p.point_id,
+            p.x,
+            p.y,
+            ST_Transform(ST_SetSRID(ST_MakePoint(p.x, p.y), :srid), 5179) AS geom
+        FROM
+            unnest(CAST(:xs AS float8[]), CAST(:ys AS float8[]))
+                WITH ORDINALITY AS p(x, y, point_id)
+    )
+    SELECT
+        p.point_id,
+        p.x,
+        p.y,
+        nearest.distance
+    FROM
+        pts_geom p
+        LEFT JOIN LATERAL (
+            SELECT
+                ST_Distance(p.geom, t.geometry) AS distance
+            FROM
+                public."{table_name}" t
+            WHERE
+                t.year = :year
+            ORDER BY
+                t.geometry <-> p.geom
+            LIMIT 1
+        ) AS nearest ON true
+    ORDER BY
+        p.point_id;
+"""
+
+
+# LRU cache of custom nearest-feature distances keyed by
+# (table, year, srid, x, y). The source tables only change on reload, so
+# restart the workers after reloading them.
+NEAREST_DISTANCE_CACHE_SIZE = 100_000
+_nearest_distance_cache: OrderedDict[tuple, float | None] = OrderedDict()
+_nearest_distance_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _load_feature_tree(table_name: str, year: int) -> "STRtree":
+    """
+    Load the features of a small table for one year into an in-process STRtree.
+
+    Cached per (table, year) for the life of the worker; restart the workers
+    after reloading the table. Every feature row is held in memory, so large
+    layers (roads, coastline) stay on the SQL KNN lookup.
+
+    Args:
+        table_name: Table with `geometry` (EPSG:5179) and `year` columns
+        year: Year of the features to load
+
+    Returns:
+        STRtree over the table's geometries
+    """
+    import shapely
+
+    sql = _cached_text(
+        f'SELECT ST_AsBinary(t.geometry) FROM public."{table_name}" t '
+        "WHERE t.year = :year"
+    )
+    with engine.connect() as conn:
+        wkbs = conn.execute(sql, {"year": year}).scalars().all()
+    return shapely.STRtree(shapely.from_wkb([bytes(wkb) for wkb in wkbs]))
+
+
+@lru_cache(maxsize=8)
+def _transformer_to_5179(srid: int) -> "Transformer":
+    """Return a cached transformer from `srid` to EPSG:5179 in x/y order."""
+    from pyproj import Transformer
+
+    return Transformer.from_crs(srid, 5179, always_xy=True)
+
+
+class CustomPointShortestDistanceCalculator(CustomPointAbstractCalculator):
+    """Calculator for shortest distance from custom points to the nearest feature."""
+
+    def records(self) -> list[dict]:
+        """
+        Execute the shortest distance calculation for custom coordinates.
+
+        Distinct coordinates that are not cached yet are sent as arrays in one
+        query and each point finds its nearest feature with a KNN `<->` lookup
+        on the GiST index.
+
+        Returns:
+            List of result rows, one per coordinate
+        """
+        self.validate_year()
+        column_name = f"{self.label_prefix}_{self.year}"
+
+        if not self.coordinates:
+            return []
+
+        points = [(float(x), float(y)) for x, y in self.coordinates]
+        cache_prefix = (self.table_name, self.year, self.srid)
+
+        # Resubmitted coordinates are answered from the per-process cache; only
+        # the distinct points not seen before are sent to the database.
+        distances = {}
+        with _nearest_distance_lock:
+            for point in points:
+                key = cache_prefix + point
+                if key in _nearest_distance_cache:
+                    _nearest_distance_cache.move_to_end(key)
+                    distances[point] = _nearest_distance_cache[key]
+        missing = [point for point in dict.fromkeys(points) if point not in distances]
+
+        sql = _cached_text(_NEAREST_FEATURE_SQL.format(table_name=self.table_name))
+
+        try:
+            if missing:
+                with engine.connect() as conn:
+                    result = conn.execute(
+                        sql,
+                        {
+                            "xs": [x for x, _ in missing],
+                            "ys": [y for _, y in missing],
+                            "srid": self.srid,
+                            "year": self.year,
+                        },
                     )
-                    AND CAST(SUBSTRING(t.date, 1, 4) AS INTEGER) <= {self.year}
-                    AND (t.date_c IS NULL OR CAST(SUBSTRING(t.date_c, 1, 4) AS INTEGER) >= {self.year})
-                """
-            )
+                    for p_id, _, _, distance in result:
+                        distances[missing[p_id - 1]] = distance
+
+                with _nearest_distance_lock:
+                    for point in missing:
+                        _nearest_distance_cache[cache_prefix + point] = distances[point]
+                    while len(_nearest_distance_cache) > NEAREST_DISTANCE_CACHE_SIZE:
+                        _nearest_distance_cache.popitem(last=False)
+
+            return [
+                {"point_id": p_id, "x": x, "y": y, column_name: distances[(x, y)]}
+                for p_id, (x, y) in enumerate(points, start=self.first_point_id)
+            ]
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
 
-            try:
-                result = conn.execute(sql)
-                rows = result.all()
-                if rows:
-                    results.extend([dict(row._mapping) for row in rows])
-                else:
-                    results.append({"point_id": _i, "x": x, "y": y, column_name: 0})
-            except Exception as e:
-                logger.error(f"Error in {self.__class__.__name__} for point {_i}: {e}")
-                results.append({"point_id": _i, "x": x, "y": y, column_name: 0})
 
-        return pd.DataFrame(results)
+class CustomAirportDistanceCalculator(CustomPointShortestDistanceCalculator):
+    """Calculator for shortest distance from custom coordinates to the nearest airport."""
+
+    @property
+    def table_name(self) -> str:
+        return "airport"
+
+    @property
+    def label_prefix(self) -> str:
+        return "D_Airport"
+
+    @property
+    def valid_years(self) -> list[int]:
+        return [2000, 2005, 2010, 2015, 2020]
+
+    def records(self) -> list[dict]:
+        """
+        Execute the shortest distance calculation for custom coordinates.
+
+        There are only a handful of airports per year, so they are loaded once
+        per worker into an STRtree and the points are projected and matched in
+        process, without a database round trip per batch.
+
+        Returns:
+            List of result rows, one per coordinate
+        """
+        self.validate_year()
+        column_name = f"{self.label_prefix}_{self.year}"
+
+        if not self.coordinates:
+            return []
+
+        import shapely
+
+        try:
+            tree = _load_feature_tree(self.table_name, self.year)
+            xs = [float(x) for x, _ in self.coordinates]
+            ys = [float(y) for _, y in self.coordinates]
+            if self.srid != 5179:
+                # Lists rather than arrays: pyproj tries its scalar path first,
+                # which warns on (and will reject) one-element arrays
+                xs, ys = _transformer_to_5179(self.srid).transform(xs, ys)
+
+            # Points with no airport that year keep a null distance, as in SQL
+            distances = np.full(len(xs), np.nan)
+            if len(tree.geometries):
+                (point_idx, _), nearest = tree.query_nearest(
+                    shapely.points(xs, ys), return_distance=True, all_matches=False
+                )
+                distances[point_idx] = nearest
+
+            return [
+                {
+                    "point_id": p_id,
+                    "x": float(x),
+                    "y": float(y),
+                    column_name: None if np.isnan(distance) else float(distance),
+                }
+                for p_id, (x, y), distance in zip(
+                    range(self.first_point_id, self.first_point_id + len(xs)),
+                    self.coordinates,
+                    distances.tolist(),
+                )
+            ]
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
 
 
 class RoadLengthCalculator(PointAbstractCalculator):
@@ -1534,24 +1965,65 @@ class RoadLengthCalculator(PointAbstractCalculator):
     def valid_years(self) -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
+            f"""
+            SELECT
+                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{self.buffer_size.value}), sb.geom_{self.buffer_size.value}))), 0) AS {self.label_prefix}
+            FROM
+                jgg_centroid_adjusted_buffered sb
+                LEFT JOIN (select * from {self.table_name} where year = {self.year}) r ON r.geometry && sb.geom_{self.buffer_size.value} AND ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+            GROUP BY
+                sb.tot_reg_cd;
+            """
+        )
+        return sql
+
+    @classmethod
+    def calculate_multi(cls, buffer_sizes: list[BufferSize], year: int) -> pd.DataFrame:
+        """
+        Execute the road length calculation for several buffer sizes in one query.
+
+        Roads are joined once against the largest buffer and each buffer size
+        becomes a conditional sum over the same candidate roads.
+
+        Args:
+            buffer_sizes: Buffer sizes to calculate
+            year: Reference year for the calculation
+
+        Returns:
+            DataFrame containing one road length column per buffer size
+        """
+        if not buffer_sizes:
+            raise ValueError("No buffer sizes provided")
+
+        calculators = [cls(b, year) for b in buffer_sizes]
+        max_buffer = max(b.value for b in buffer_sizes)
+        columns = ",\n".join(
+            f"COALESCE(SUM(CASE WHEN r.geometry && sb.geom_{c.buffer_size.value} THEN ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{c.buffer_size.value}), sb.geom_{c.buffer_size.value})) ELSE 0 END), 0) AS {c.label_prefix}"
+            for c in calculators
+        )
+
+        sql = _cached_text(
             f"""
             SELECT
-                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(r.geometry, sb.geom_{self.buffer_size.value}))), 0) AS {self.label_prefix}
+                sb.tot_reg_cd,
+                {columns}
             FROM
                 jgg_centroid_adjusted_buffered sb
-                LEFT JOIN (select * from {self.table_name} where year = {self.year}) r ON ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+                LEFT JOIN (select * from {calculators[0].table_name} where year = {year}) r ON r.geometry && sb.geom_{max_buffer} AND ST_Intersects(r.geometry, sb.geom_{max_buffer})
             GROUP BY
                 sb.tot_reg_cd;
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            with engine.connect() as conn:
+                result = conn.execute(sql)
+                rows = result.all()
+                columns = list(result.keys())
+            return pd.DataFrame(rows, columns=columns)
         except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            logger.error(f"Error in {cls.__name__}: {e}")
             raise
 
 
@@ -1572,15 +2044,15 @@ class RoadLengthLaneCalculator(PointAbstractCalculator):
     def valid_years(self) -> list[int]:
         return [2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
             f"""
             WITH lls AS (
             SELECT
-                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(r.geometry, sb.geom_{self.buffer_size.value}))*r.lanes), 0)  AS ll
+                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{self.buffer_size.value}), sb.geom_{self.buffer_size.value}))*r.lanes), 0)  AS ll
             FROM
                 jgg_centroid_adjusted_buffered sb
-                LEFT JOIN (select * from roads where year = {self.year}) r ON ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+                LEFT JOIN (select * from roads where year = {self.year}) r ON r.geometry && sb.geom_{self.buffer_size.value} AND ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
             GROUP BY
                 sb.tot_reg_cd , r.lanes
             )
@@ -1589,13 +2061,7 @@ class RoadLengthLaneCalculator(PointAbstractCalculator):
             GROUP BY tot_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class RoadLengthLaneWidthCalculator(PointAbstractCalculator):
@@ -1615,15 +2081,15 @@ class RoadLengthLaneWidthCalculator(PointAbstractCalculator):
     def valid_years() -> list[int]:
         return [2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
             f"""
             WITH llws AS (
             SELECT
-                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(r.geometry, sb.geom_{self.buffer_size.value}))*r.lanes*r.width), 0)  AS llw
+                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{self.buffer_size.value}), sb.geom_{self.buffer_size.value}))*r.lanes*r.width), 0)  AS llw
             FROM
                 jgg_centroid_adjusted_buffered sb
-                LEFT JOIN (select roads.geometry, rd.lanes, rd.width from roads join roads_{self.year} rd on rd.id = roads.original_id where year = {self.year}) r ON ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+                LEFT JOIN (select roads.geometry, rd.lanes, rd.width from roads join roads_{self.year} rd on rd.id = roads.original_id where year = {self.year}) r ON r.geometry && sb.geom_{self.buffer_size.value} AND ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
             GROUP BY
                 sb.tot_reg_cd , r.lanes, r.width
             )
@@ -1632,13 +2098,7 @@ class RoadLengthLaneWidthCalculator(PointAbstractCalculator):
             GROUP BY tot_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class AbstractMrLengthCalculator(PointAbstractCalculator):
@@ -1658,25 +2118,19 @@ class AbstractMrLengthCalculator(PointAbstractCalculator):
     def valid_years(self) -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
             f"""
             SELECT
-                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(r.geometry, sb.geom_{self.buffer_size.value}))), 0) AS {self.label_prefix}
+                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{self.buffer_size.value}), sb.geom_{self.buffer_size.value}))), 0) AS {self.label_prefix}
             FROM
                 jgg_centroid_adjusted_buffered sb
-                LEFT JOIN (select * from {self.table_name} where year = {self.year}) r ON ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+                LEFT JOIN (select * from {self.table_name} where year = {self.year}) r ON r.geometry && sb.geom_{self.buffer_size.value} AND ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
             GROUP BY
                 sb.tot_reg_cd;
                 """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class Mr1LengthCalculator(AbstractMrLengthCalculator):
@@ -1708,15 +2162,15 @@ class AbstractMrLengthLaneCalculator(PointAbstractCalculator):
     def valid_years(self) -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
             f"""
             WITH lls AS (
             SELECT
-                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(r.geometry, sb.geom_{self.buffer_size.value}))*r.lanes), 0)  AS ll
+                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{self.buffer_size.value}), sb.geom_{self.buffer_size.value}))*r.lanes), 0)  AS ll
             FROM
                 jgg_centroid_adjusted_buffered sb
-                LEFT JOIN (select * from {self.table_name} join roads_{self.year} rd on rd.id = {self.table_name}.roads_{self.year}_id where year = {self.year}) r ON ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+                LEFT JOIN (select * from {self.table_name} join roads_{self.year} rd on rd.id = {self.table_name}.roads_{self.year}_id where year = {self.year}) r ON r.geometry && sb.geom_{self.buffer_size.value} AND ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
             GROUP BY
                 sb.tot_reg_cd , r.lanes
             )
@@ -1725,13 +2179,7 @@ class AbstractMrLengthLaneCalculator(PointAbstractCalculator):
             GROUP BY tot_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class Mr1LengthLaneCalculator(AbstractMrLengthLaneCalculator):
@@ -1763,15 +2211,15 @@ class AbstractMrLengthLaneWidthCalculator(PointAbstractCalculator):
     def valid_years() -> list[int]:
         return [2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
             f"""
             WITH llws AS (
             SELECT
-                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(r.geometry, sb.geom_{self.buffer_size.value}))*r.lanes*r.width), 0)  AS llw
+                sb.tot_reg_cd, COALESCE(SUM(ST_Length(ST_Intersection(ST_ClipByBox2D(r.geometry, sb.geom_{self.buffer_size.value}), sb.geom_{self.buffer_size.value}))*r.lanes*r.width), 0)  AS llw
             FROM
                 jgg_centroid_adjusted_buffered sb
-                LEFT JOIN (select * from {self.table_name} join roads_{self.year} rd on rd.id = {self.table_name}.roads_{self.year}_id where year = {self.year}) r ON ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
+                LEFT JOIN (select * from {self.table_name} join roads_{self.year} rd on rd.id = {self.table_name}.roads_{self.year}_id where year = {self.year}) r ON r.geometry && sb.geom_{self.buffer_size.value} AND ST_Intersects(r.geometry, sb.geom_{self.buffer_size.value})
             GROUP BY
                 sb.tot_reg_cd , r.lanes
             )
@@ -1780,13 +2228,7 @@ class AbstractMrLengthLaneWidthCalculator(PointAbstractCalculator):
             GROUP BY tot_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class Mr1LengthLaneWidthCalculator(AbstractMrLengthLaneWidthCalculator):
@@ -1818,8 +2260,8 @@ class PopulationCalculator(PointAbstractCalculator):
     def valid_years() -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
-        sql = text(
+    def build_sql(self) -> TextClause:
+        sql = _cached_text(
             f"""SELECT
             ia.center_reg_cd as tot_reg_cd,
             COALESCE(SUM(p.pop::float * ia.intersect_area / ia.border_area), 0) AS {f'"{self.label_prefix}{str(self.buffer_size.value).zfill(4)}"'},
@@ -1835,13 +2277,7 @@ class PopulationCalculator(PointAbstractCalculator):
                 ia.center_reg_cd;
             """
         )
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class AbstractNdviStatisticCalculator(PointAbstractCalculator):
@@ -1868,9 +2304,9 @@ class AbstractNdviStatisticCalculator(PointAbstractCalculator):
     def valid_years() -> list[int]:
         return [2000, 2005, 2010, 2015, 2020]
 
-    def calculate(self) -> pd.DataFrame:
+    def build_sql(self) -> TextClause:
         if self.statistic_type != "median":
-            sql = text(
+            sql = _cached_text(
                 f"""
                 SELECT
                     ms.tot_reg_cd,
@@ -1888,33 +2324,23 @@ class AbstractNdviStatisticCalculator(PointAbstractCalculator):
                 """
             )
         else:
-            sql = text(
+            # Median zonal statistics are precomputed by `scripts/ndvi_zonal_stats.sql`
+            # because clipping the raster per centroid is too slow to do per request.
+            sql = _cached_text(
                 f"""
                 SELECT
-                    ms.tot_reg_cd,
-                    COALESCE(AVG((ST_SummaryStats(ST_Clip(ns.rast, ST_Buffer(ms.geom, {self.buffer_size.value})))).mean), 0) AS {self.label_prefix}{self.statistic_type}_{str(self.buffer_size.value).zfill(4)}
+                    nz.tot_reg_cd,
+                    nz.mean AS {self.label_prefix}{self.statistic_type}_{str(self.buffer_size.value).zfill(4)}
                 FROM
-                    "public"."jgg_centroid_adjusted" ms
-                LEFT JOIN
-                    "public".ndvi_statistics ns
-                ON
-                    ST_Intersects(ns.rast, ST_Buffer(ms.geom, {self.buffer_size.value}))
-                AND
-                    ns."year" = {self.year}
+                    "public".ndvi_zonal_stats nz
+                WHERE
+                    nz."year" = {self.year}
                 AND
-                    ns.statistic = 'median'
-                GROUP BY
-                    ms.tot_reg_cd, ms.geom;
+                    nz.buffer_size = {self.buffer_size.value};
                 """
             )
 
-        try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
-        except Exception as e:
-            logger.error(f"Error in {self.__class__.__name__}: {e}")
-            raise
+        return sql
 
 
 class NdviStatisticMeanCalculator(AbstractNdviStatisticCalculator):
@@ -1966,15 +2392,13 @@ class JggCentroidRelativeDemDsmCalculator:
         self.inner_buffer = inner_buffer
 
     def calculate(self) -> pd.DataFrame:
-        sql = text(
+        sql = _cached_text(
             f"""
             SELECT * FROM jgg_centroid_relative_{self.table_type}_{self.inner_buffer}_donut
             """
         )
         try:
-            result = conn.execute(sql)
-            rows = result.all()
-            return pd.DataFrame([dict(row._mapping) for row in rows])
+            return read_sql_copy(engine, sql, dtype={"tot_reg_cd": str})
         except Exception as e:
             logger.error(f"Error in {self.__class__.__name__}: {e}")
             raise
@@ -2006,9 +2430,9 @@ class LanduseCalculator(PointAbstractCalculator):
         """
         Execute the landuse calculation based on buffer zones.
 
-        This calculates the ratio of each landuse type's area within the buffer to the
-        total buffer area for all specified landuse codes. Uses a loop with tqdm for
-        progress tracking.
+        This reads the ratio of each landuse type's area within the buffer to the
+        total buffer area for all specified landuse codes from the precomputed
+        `landuse_ratio` table, then pivots to one column per code.
 
         Returns:
             DataFrame containing calculation results with landuse variables
@@ -2021,58 +2445,48 @@ class LanduseCalculator(PointAbstractCalculator):
         codes = [110, 120, 130, 140, 150, 160, 200, 310, 320, 330, 400, 500, 600, 710]
 
         # Get the list of all jgg centroids first
-        sql = text("SELECT tot_reg_cd FROM jgg_centroid_adjusted ORDER BY tot_reg_cd")
         try:
-            result = conn.execute(sql)
-            tot_reg_cd_rows = result.all()
+            tot_reg_cds = list(_get_tot_reg_cds())
         except Exception as e:
             logger.error(f"Error fetching tot_reg_cd in {self.__class__.__name__}: {e}")
             raise
 
-        # Process each code separately with progress tracking
-        all_dataframes = []
-
-        for code in tqdm(codes, desc="Processing landuse codes"):
-            varname = f"{self.label_prefix}{code}_{str(buffer_value).zfill(4)}"
+        # The overlay of buffered centroids and landuse polygons is precomputed by
+        # `scripts/landuse_ratio.sql`; both layers are static, so there is no need
+        # to redo the spatial join per request.
+        sql = _cached_text(
+            f"""
+            SELECT
+                lr.tot_reg_cd,
+                lr.code,
+                lr.ratio
+            FROM
+                "public".landuse_ratio lr
+            WHERE
+                lr."year" = {self.year}
+            AND
+                lr.buffer_size = {buffer_value};
+            """
+        )
 
-            sql = text(
-                f"""
-                SELECT
-                    a_buffered.tot_reg_cd,
-                    COALESCE(
-                        SUM(
-                            ST_Area(ST_Intersection(a_buffered.geom_{buffer_value}, b.geometry))
-                        ) / ({buffer_value * buffer_value * 3.14159265358979323846}),
-                        0
-                    ) AS "{varname}"
-                FROM
-                    jgg_centroid_adjusted_buffered AS a_buffered
-                LEFT JOIN
-                    "{self.table_name}" AS b
-                ON
-                    ST_Intersects(a_buffered.geom_{buffer_value}, b.geometry)
-                    AND b.code = {code}
-                GROUP BY
-                    a_buffered.tot_reg_cd
-                ORDER BY
-                    a_buffered.tot_reg_cd;
-                """
-            )
+        try:
+            df = read_sql_copy(engine, sql, dtype={"tot_reg_cd": str})
+        except Exception as e:
+            logger.error(f"Error in {self.__class__.__name__}: {e}")
+            raise
 
-            try:
-                result = conn.execute(sql)
-                rows = result.all()
-                df = pd.DataFrame([dict(row._mapping) for row in rows])
-                all_dataframes.append(df)
-            except Exception as e:
-                logger.error(f"Error in {self.__class__.__name__} for code {code}: {e}")
-                raise
-
-        # Merge all dataframes into one
-        if all_dataframes:
-            return merge_dataframes_by_id(all_dataframes, id_column="tot_reg_cd")
-        else:
-            return pd.DataFrame()
+        # Only non-zero (centroid, code) pairs are stored, so the reindex below
+        # restores every centroid and code with a ratio of 0.
+        ratios = (
+            df.astype({"code": int})
+            .pivot(index="tot_reg_cd", columns="code", values="ratio")
+            .reindex(index=tot_reg_cds, columns=codes)
+            .fillna(0)
+        )
+        ratios.columns = [
+            f"{self.label_prefix}{code}_{str(buffer_value).zfill(4)}" for code in codes
+        ]
+        return ratios.rename_axis("tot_reg_cd").reset_index()
 
 
 if __name__ == "__main__":
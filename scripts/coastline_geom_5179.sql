@@ -0,0 +1,26 @@
+-- EPSG:5179 copies of the yearly coastline geometries.
+--
+-- The border CoastlineDistanceCalculator measures from every border centroid to
+-- coastline_{year}, whose geometries are stored in another SRID. Storing the
+-- transformed geometry once avoids an ST_Transform per (border, coastline) pair.
+--
+-- Rollback:
+--     ALTER TABLE coastline_<year> DROP COLUMN IF EXISTS geom_5179;
+
+DO $$
+DECLARE
+    r_year integer;
+BEGIN
+    FOREACH r_year IN ARRAY ARRAY[2000, 2005, 2010, 2015, 2020]
+    LOOP
+        RAISE NOTICE 'Processing year: %', r_year;
+
+        EXECUTE format(
+            'ALTER TABLE public.%I ADD COLUMN IF NOT EXISTS geom_5179 geometry '
+            'GENERATED ALWAYS AS (ST_Transform(geom, 5179)) STORED',
+            'coastline_' || r_year
+        );
+
+        EXECUTE format('ANALYZE public.%I', 'coastline_' || r_year);
+    END LOOP;
+END $$;
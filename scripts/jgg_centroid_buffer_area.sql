@@ -0,0 +1,23 @@
+-- Precomputed buffer areas on jgg_centroid_adjusted_buffered.
+--
+-- LanduseCalculator divides the landuse area inside each buffer by these
+-- columns instead of recomputing pi * r * r for every row.
+--
+-- Rollback:
+--     ALTER TABLE jgg_centroid_adjusted_buffered
+--         DROP COLUMN IF EXISTS buf_area_100,
+--         DROP COLUMN IF EXISTS buf_area_300,
+--         DROP COLUMN IF EXISTS buf_area_500,
+--         DROP COLUMN IF EXISTS buf_area_1000,
+--         DROP COLUMN IF EXISTS buf_area_5000;
+
+ALTER TABLE jgg_centroid_adjusted_buffered
+    ADD COLUMN IF NOT EXISTS buf_area_100 double precision GENERATED ALWAYS AS (ST_Area(geom_100)) STORED,
+    ADD COLUMN IF NOT EXISTS buf_area_300 double precision GENERATED ALWAYS AS (ST_Area(geom_300)) STORED,
+    ADD COLUMN IF NOT EXISTS buf_area_500 double precision GENERATED ALWAYS AS (ST_Area(geom_500)) STORED,
+    ADD COLUMN IF NOT EXISTS buf_area_1000 double precision GENERATED ALWAYS AS (ST_Area(geom_1000)) STORED,
+    ADD COLUMN IF NOT EXISTS buf_area_5000 double precision GENERATED ALWAYS AS (ST_Area(geom_5000)) STORED;
+
+-- LanduseCalculator filters landuse candidates with ST_DWithin on the centroid
+CREATE INDEX IF NOT EXISTS jgg_centroid_adjusted_geom_idx
+    ON jgg_centroid_adjusted USING GIST (geom);
@@ -0,0 +1,121 @@
+-- Precomputed landuse ratios for every jgg centroid buffer.
+--
+-- LanduseCalculator reads from this table instead of overlaying the buffered
+-- centroids with the landuse polygons on every request. Only (centroid, code)
+-- pairs with some landuse area are stored; the calculator fills the rest with 0. The overlay reads the
+-- subdivided landuse tables (`landuse_subdivided.sql`) and the stored buffer
+-- areas (`jgg_centroid_buffer_area.sql`), so run those scripts first.
+--
+-- Rollback:
+--     DROP TABLE IF EXISTS landuse_ratio;
+--     DROP TABLE IF EXISTS landuse_ratio_stage;
+
+-- 1) Create your target table (if not already created):
+CREATE TABLE IF NOT EXISTS landuse_ratio (
+    tot_reg_cd    text,
+    year          integer,
+    buffer_size   integer,
+    code          integer,
+    ratio         double precision
+);
+
+CREATE INDEX IF NOT EXISTS landuse_ratio_year_buffer_size_idx
+    ON landuse_ratio (year, buffer_size);
+
+-- Let the planner split the overlay across parallel workers. The buffered
+-- centroid scan is the outer side of the join, so each worker takes a share of
+-- the centroids and probes the landuse GiST index independently. PostgreSQL
+-- never plans INSERT ... SELECT in parallel, so each overlay is first built with
+-- CREATE TABLE ... AS (which can be) and then copied into landuse_ratio.
+SET max_parallel_workers_per_gather = 8;
+SET parallel_setup_cost = 100;
+SET parallel_tuple_cost = 0.001;
+SET min_parallel_table_scan_size = '1MB';
+
+-- 2) PL/pgSQL block to loop over years and buffer sizes and insert:
+DO $$
+DECLARE
+    r_year        integer;
+    r_buffer_size integer;
+    r_table       text;
+BEGIN
+    FOREACH r_year IN ARRAY ARRAY[2000, 2005, 2010, 2015, 2020]
+    LOOP
+        IF r_year = 2020 THEN
+            r_table := 'landuse_v004_2020_simplified_subdivided';
+        ELSE
+            r_table := format('landuse_v002_%s_subdivided', r_year);
+        END IF;
+
+        FOREACH r_buffer_size IN ARRAY ARRAY[100, 300, 500, 1000, 5000]
+        LOOP
+            RAISE NOTICE 'Processing year: %, buffer_size: %', r_year, r_buffer_size;
+
+            DROP TABLE IF EXISTS landuse_ratio_stage;
+
+            EXECUTE format(
+                $sql$
+                CREATE UNLOGGED TABLE landuse_ratio_stage AS
+                -- Pass 2: area only for the surviving pairs, clipping only the
+                -- pieces that cross the buffer boundary
+                SELECT
+                    p.tot_reg_cd,
+                    %1$s AS year,
+                    %2$s AS buffer_size,
+                    p.code,
+                    SUM(
+                        CASE
+                            WHEN ST_Contains(p.buffer_geom, p.geometry)
+                            THEN ST_Area(p.geometry)
+                            ELSE ST_Area(ST_Intersection(p.buffer_geom, p.geometry))
+                        END
+                        / p.buffer_area
+                    ) AS ratio
+                FROM (
+                    -- Pass 1: cheap index-driven candidate pairs, with the exact
+                    -- intersects test on the small subdivided pieces. A subquery
+                    -- rather than a CTE, whose scan would be parallel restricted.
+                    SELECT
+                        a_buffered.tot_reg_cd,
+                        b.code,
+                        b.geometry,
+                        a_buffered.%3$I AS buffer_geom,
+                        a_buffered.%4$I AS buffer_area
+                    FROM
+                        jgg_centroid_adjusted_buffered AS a_buffered
+                    JOIN
+                        jgg_centroid_adjusted AS a
+                    ON
+                        a.tot_reg_cd = a_buffered.tot_reg_cd
+                    JOIN
+                        %5$I AS b
+                    ON
+                        ST_DWithin(a.geom, b.geometry, %2$s)
+                        AND b.code = ANY(ARRAY[110, 120, 130, 140, 150, 160, 200, 310, 320, 330, 400, 500, 600, 710])
+                    WHERE
+                        ST_Intersects(a_buffered.%3$I, b.geometry)
+                ) AS p
+                GROUP BY
+                    p.tot_reg_cd,
+                    p.code
+                $sql$,
+                r_year,
+                r_buffer_size,
+                'geom_' || r_buffer_size,
+                'buf_area_' || r_buffer_size,
+                r_table
+            );
+
+            DELETE FROM landuse_ratio
+            WHERE year = r_year AND buffer_size = r_buffer_size;
+
+            INSERT INTO landuse_ratio (tot_reg_cd, year, buffer_size, code, ratio)
+            SELECT tot_reg_cd, year, buffer_size, code, ratio
+            FROM landuse_ratio_stage;
+
+            DROP TABLE landuse_ratio_stage;
+
+            COMMIT;
+        END LOOP;
+    END LOOP;
+END $$;
@@ -0,0 +1,54 @@
+-- Subdivided copies of the landuse tables used by LanduseCalculator.
+--
+-- ST_Subdivide splits each landuse polygon into pieces of at most 256 vertices.
+-- The smaller bounding boxes make the GiST probe against the centroid buffers
+-- far more selective, and ST_Intersection runs on small polygons instead of
+-- the original multi-thousand vertex parcels. Areas are additive across the
+-- pieces, so landuse ratios are unchanged.
+--
+-- Rollback:
+--     DROP TABLE IF EXISTS landuse_v002_2000_subdivided, landuse_v002_2005_subdivided,
+--         landuse_v002_2010_subdivided, landuse_v002_2015_subdivided,
+--         landuse_v004_2020_simplified_subdivided;
+
+DO $$
+DECLARE
+    r_table text;
+BEGIN
+    FOREACH r_table IN ARRAY ARRAY[
+        'landuse_v002_2000',
+        'landuse_v002_2005',
+        'landuse_v002_2010',
+        'landuse_v002_2015',
+        'landuse_v004_2020_simplified'
+    ]
+    LOOP
+        RAISE NOTICE 'Subdividing table: %', r_table;
+
+        EXECUTE format('DROP TABLE IF EXISTS %I', r_table || '_subdivided');
+
+        EXECUTE format(
+            'CREATE TABLE %I AS
+             SELECT code, ST_Subdivide(geometry, 256) AS geometry
+             FROM %I',
+            r_table || '_subdivided',
+            r_table
+        );
+
+        EXECUTE format(
+            'CREATE INDEX %I ON %I USING GIST (geometry)',
+            r_table || '_subdivided_geometry_idx',
+            r_table || '_subdivided'
+        );
+
+        EXECUTE format(
+            'CREATE INDEX %I ON %I (code)',
+            r_table || '_subdivided_code_idx',
+            r_table || '_subdivided'
+        );
+
+        EXECUTE format('ANALYZE %I', r_table || '_subdivided');
+
+        COMMIT;
+    END LOOP;
+END $$;
@@ -0,0 +1,62 @@
+-- Precomputed NDVI median zonal statistics for every jgg centroid buffer.
+--
+-- NdviStatisticMedianCalculator reads from this table instead of running
+-- ST_Clip + ST_SummaryStats over the median raster on every request.
+--
+-- Rollback:
+--     DROP TABLE IF EXISTS ndvi_zonal_stats;
+
+-- 1) Create your target table (if not already created):
+CREATE TABLE IF NOT EXISTS ndvi_zonal_stats (
+    tot_reg_cd    text,
+    year          integer,
+    buffer_size   integer,
+    mean          double precision
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ndvi_zonal_stats_year_buffer_size_tot_reg_cd_idx
+    ON ndvi_zonal_stats (year, buffer_size, tot_reg_cd);
+
+-- 2) PL/pgSQL block to loop over years and buffer sizes and insert:
+DO $$
+DECLARE
+    r_year        integer;
+    r_buffer_size integer;
+BEGIN
+    FOREACH r_year IN ARRAY ARRAY[2000, 2005, 2010, 2015, 2020]
+    LOOP
+        FOREACH r_buffer_size IN ARRAY ARRAY[100, 300, 500, 1000, 5000]
+        LOOP
+            RAISE NOTICE 'Processing year: %, buffer_size: %', r_year, r_buffer_size;
+
+            DELETE FROM ndvi_zonal_stats
+            WHERE year = r_year AND buffer_size = r_buffer_size;
+
+            INSERT INTO ndvi_zonal_stats (
+                tot_reg_cd,
+                year,
+                buffer_size,
+                mean
+            )
+            SELECT
+                ms.tot_reg_cd,
+                r_year,
+                r_buffer_size,
+                COALESCE(AVG((ST_SummaryStats(ST_Clip(ns.rast, ST_Buffer(ms.geom, r_buffer_size)))).mean), 0)
+            FROM
+                "public"."jgg_centroid_adjusted" ms
+            LEFT JOIN
+                "public".ndvi_statistics ns
+            ON
+                ST_Intersects(ns.rast, ST_Buffer(ms.geom, r_buffer_size))
+            AND
+                ns."year" = r_year
+            AND
+                ns.statistic = 'median'
+            GROUP BY
+                ms.tot_reg_cd, ms.geom;
+
+            COMMIT;
+        END LOOP;
+    END LOOP;
+END $$;
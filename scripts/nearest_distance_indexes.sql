@@ -0,0 +1,44 @@
+-- Indexes used by the nearest-feature distance calculators.
+--
+-- JggCentroidShortestDistanceCalculator finds the nearest feature with a KNN
+-- `ORDER BY dst.geometry <-> src.geom LIMIT 1` per centroid, which needs a GiST
+-- index on the geometry column; the btree on year serves the year filter.
+--
+-- Rollback:
+--     DROP INDEX IF EXISTS <table>_geometry_gix, <table>_year_idx;
+
+DO $$
+DECLARE
+    r_table text;
+BEGIN
+    FOREACH r_table IN ARRAY ARRAY[
+        'bus_stop',
+        'airport',
+        'rails',
+        'railstation',
+        'coastline',
+        'mdl',
+        'port',
+        'mr1',
+        'mr2',
+        'roads',
+        'river'
+    ]
+    LOOP
+        RAISE NOTICE 'Indexing table: %', r_table;
+
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON public.%I USING GIST (geometry)',
+            r_table || '_geometry_gix',
+            r_table
+        );
+
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON public.%I (year)',
+            r_table || '_year_idx',
+            r_table
+        );
+
+        EXECUTE format('ANALYZE public.%I', r_table);
+    END LOOP;
+END $$;
@@ -1,7 +1,15 @@
+import importlib.util
 import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import reduce
 
 import pandas as pd
+import requests
+from celery import chord, group
+from celery.exceptions import Ignore
+from celery.result import AsyncResult, GroupResult
 from dotenv import load_dotenv
 
 from border_based_calculations_by_year import (
@@ -25,26 +33,137 @@ from border_based_calculations_by_year import (
 from celery_app import celery_app
 from point_based_calculations import (
     BufferSize,
+    BusinessEmployeeCountCalculator,
+    BusinessRegistrationCountCalculator,
+    BusStopCountCalculator,
+    ClinicCountCalculator,
+    CustomAirportDistanceCalculator,
     CustomBusStopCountCalculator,
     CustomHospitalCountCalculator,
+    CustomPointBufferCountCalculator,
+    EmissionBufferSize,
+    EmissionVectorBasedCalculator,
+    HospitalCountCalculator,
+    HouseTypeCountCalculator,
+    LanduseCalculator,
+    Mr1LengthCalculator,
+    Mr1LengthLaneCalculator,
+    Mr1LengthLaneWidthCalculator,
+    Mr2LengthCalculator,
+    Mr2LengthLaneCalculator,
+    Mr2LengthLaneWidthCalculator,
+    NdviStatistic8mdnCalculator,
+    NdviStatisticMaxCalculator,
+    NdviStatisticMeanCalculator,
+    NdviStatisticMedianCalculator,
+    NdviStatisticMinCalculator,
+    PopulationCalculator,
+    RailStationCountCalculator,
+    RoadLengthCalculator,
+    RoadLengthLaneCalculator,
+    RoadLengthLaneWidthCalculator,
 )
-from supabase import create_client
 
 load_dotenv(override=True)
 
+# Coordinates per calculator call in the CSV tasks. Each call is already a single
+# unnest query, so batches mostly exist to report progress. The tasks start at
+# CSV_BATCH_SIZE and double or halve it to keep each batch between
+# CSV_BATCH_MIN_SECONDS and CSV_BATCH_MAX_SECONDS, within the min/max sizes.
+CSV_BATCH_SIZE = 5000
+CSV_MIN_BATCH_SIZE = int(os.getenv("CSV_MIN_BATCH_SIZE", 500))
+CSV_MAX_BATCH_SIZE = int(os.getenv("CSV_MAX_BATCH_SIZE", 50000))
+CSV_BATCH_MIN_SECONDS = 0.5
+CSV_BATCH_MAX_SECONDS = 5.0
+
+# Uploaded CSVs with more points than CSV_FANOUT_MIN_POINTS are split into
+# chunks of CSV_FANOUT_CHUNK_SIZE points that the point_io workers calculate in
+# parallel; smaller files are calculated in one task.
+CSV_FANOUT_MIN_POINTS = int(os.getenv("CSV_FANOUT_MIN_POINTS", 50000))
+CSV_FANOUT_CHUNK_SIZE = int(os.getenv("CSV_FANOUT_CHUNK_SIZE", 10000))
+
+# Coordinates per nearest-airport query in the point distance task
+POINT_DISTANCE_BATCH_SIZE = 5000
+
+# Minimum seconds between PROGRESS updates of the batched tasks; every update is
+# a write to the result backend
+PROGRESS_INTERVAL = 1.0
+
+# Uploaded CSVs are parsed with pyarrow's multithreaded reader when it is
+# installed (it is optional), otherwise with the pandas C parser. The streamed
+# CSV task reads in chunks, which only the C parser supports.
+CSV_PARSER_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+# Seconds a signed Supabase Storage URL stays valid while a CSV is streamed
+CSV_SIGNED_URL_EXPIRES_IN = 60
+
+# Shared session for the CSV downloads, so consecutive files from Supabase
+# Storage reuse kept-alive TLS connections instead of a new handshake per file
+http_session = requests.Session()
+http_session.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=50)
+)
+
+# Seconds a calculator result stays cached; delete the `calculation:*` keys to
+# invalidate after reloading source tables.
+CALCULATION_CACHE_TTL = int(os.getenv("CALCULATION_CACHE_TTL", 60 * 60 * 24 * 7))
+redis_client = celery_app.backend.client
+
+
+def _report_progress(self, last_update: float, meta: dict) -> float:
+    """
+    Send a PROGRESS update unless one was sent less than PROGRESS_INTERVAL ago.
 
-def df_to_json(df: pd.DataFrame):
-    # Celery needs serializable results, so we convert DataFrame to JSON here
-    return df.to_dict(orient="records")
+    Args:
+        last_update: `time.monotonic()` of the previous update
+        meta: Progress fields for the update
+
+    Returns:
+        `time.monotonic()` of the latest update that was actually sent
+    """
+    now = time.monotonic()
+    if now - last_update < PROGRESS_INTERVAL:
+        return last_update
+    self.update_state(state="PROGRESS", meta=meta)
+    return now
+
+
+def _next_csv_batch_size(batch_size: int, elapsed: float) -> int:
+    """Return the size of the next CSV batch given how long the last one took."""
+    if elapsed < CSV_BATCH_MIN_SECONDS:
+        return min(batch_size * 2, CSV_MAX_BATCH_SIZE)
+    if elapsed > CSV_BATCH_MAX_SECONDS:
+        return max(batch_size // 2, CSV_MIN_BATCH_SIZE)
+    return batch_size
 
 
 def run_calculation(self, calculator_class, year, identifier_value, identifier_enum):
     """Helper function to run calculation and handle exceptions."""
     try:
         identifier = identifier_enum(identifier_value)
+
+        # The calculators are deterministic for a given (calculator, year,
+        # identifier), so reuse an earlier result from the Celery Redis backend.
+        # The serializer is part of the key so entries written in an older
+        # format are never decoded with the current one. Entries are unpickled,
+        # so this relies on Redis being trusted (see celery_app.py).
+        cache_key = (
+            f"calculation:{celery_app.conf.result_serializer}:"
+            f"{calculator_class.__name__}:{year}:{identifier.value}"
+        )
+        cached = redis_client.get(cache_key)
+        if cached is not None:
+            return celery_app.backend.decode(cached)
+
         calc = calculator_class(identifier, year)
+        # Results use a compressed pickle serializer (see celery_app.py), so the
+        # DataFrame is stored as its column buffers instead of one JSON object
+        # per row. The API converts it to records when the job status is read.
         df = calc.calculate()
-        return df_to_json(df)
+        redis_client.setex(
+            cache_key, CALCULATION_CACHE_TTL, celery_app.backend.encode(df)
+        )
+        return df
     except Exception as e:
         self.update_state(
             state="FAILURE", meta={"exc_type": type(e).__name__, "exc_message": str(e)}
@@ -57,107 +176,236 @@ def run_calculation(self, calculator_class, year, identifier_value, identifier_e
 
 # --- Border-based tasks --- BORDER
 
+# Border variable name (as used in the `/border/{name}/` endpoints) to calculator.
+# One Celery task is generated per entry as `calculate_border_{name}_task`.
+BORDER_CALCULATORS = {
+    "river": RiverCalculator,
+    "emission": EmissionCalculator,
+    "car_registration": CarRegistrationCalculator,
+    "landuse_area": LanduseAreaCalculator,
+    "coastline_distance": CoastlineDistanceCalculator,
+    "ndvi": NdviCalculator,
+    "airport_distance": AirportDistanceCalculator,
+    "mdl_distance": MilitaryDemarcationLineDistanceCalculator,
+    "port_distance": PortDistanceCalculator,
+    "rail": RailCalculator,
+    "road": RoadCalculator,
+    "topographic_model": TopographicModelCalculator,
+    "raster_emission": RasterEmissionCalculator,
+    "clinic_count": ClinicBorderCalculator,
+    "hospital_count": HospitalBorderCalculator,
+}
+
+
+def _make_border_task(name, calculator_class):
+    """Register a Celery task running `calculator_class` for a border type and year."""
+
+    @celery_app.task(bind=True, name=f"tasks.calculate_border_{name}_task")
+    def _task(self, border_type_value: str, year: int):
+        return run_calculation(
+            self, calculator_class, year, border_type_value, BorderType
+        )
 
-@celery_app.task(bind=True)
-def calculate_border_river_task(self, border_type_value: str, year: int):
-    return run_calculation(self, RiverCalculator, year, border_type_value, BorderType)
+    return _task
 
 
-@celery_app.task(bind=True)
-def calculate_border_emission_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, EmissionCalculator, year, border_type_value, BorderType
+for _name, _calculator_class in BORDER_CALCULATORS.items():
+    globals()[f"calculate_border_{_name}_task"] = _make_border_task(
+        _name, _calculator_class
     )
 
 
-@celery_app.task(bind=True)
-def calculate_border_car_registration_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, CarRegistrationCalculator, year, border_type_value, BorderType
-    )
+# Border calculators run at once by the bundle task. Each holds one pooled
+# connection while PostgreSQL works, and LanduseAreaCalculator opens its own
+# per-code connections, so stay well inside the engine's pool + overflow.
+BORDER_BUNDLE_MAX_WORKERS = 4
 
 
 @celery_app.task(bind=True)
-def calculate_border_landuse_area_task(self, border_type_value: str, year: int):
-    # TODO: error found need to fix query
-    return run_calculation(
-        self, LanduseAreaCalculator, year, border_type_value, BorderType
-    )
+def calculate_border_bundle_task(
+    self, border_type_value: str, year: int, kinds: list[str]
+):
+    """Calculate several border variables concurrently in one task.
 
+    The calculators are I/O bound on PostGIS, so running them on a thread pool
+    overlaps their query waits instead of paying for them one after another.
 
-@celery_app.task(bind=True)
-def calculate_border_coastline_distance_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, CoastlineDistanceCalculator, year, border_type_value, BorderType
-    )
+    Returns:
+        Dict of variable name to its result, in `kinds` order
+    """
+    unknown = [kind for kind in kinds if kind not in BORDER_CALCULATORS]
+    if unknown:
+        return {
+            "error": f"Unknown border variables: {', '.join(unknown)}",
+            "details": "Failed during border bundle",
+        }
 
+    def run_kind(kind: str):
+        return run_calculation(
+            self, BORDER_CALCULATORS[kind], year, border_type_value, BorderType
+        )
 
-@celery_app.task(bind=True)
-def calculate_border_ndvi_task(self, border_type_value: str, year: int):
-    return run_calculation(self, NdviCalculator, year, border_type_value, BorderType)
+    max_workers = max(1, min(len(kinds), BORDER_BUNDLE_MAX_WORKERS))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(run_kind, kinds))
+    return dict(zip(kinds, results))
 
 
-@celery_app.task(bind=True)
-def calculate_border_airport_distance_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, AirportDistanceCalculator, year, border_type_value, BorderType
-    )
+@celery_app.task
+def merge_border_results(results: list, kinds: list[str]):
+    """Merge the results of a `dispatch_all_border` chord on the border code.
 
+    Every border calculator returns the border code as its first column.
 
-@celery_app.task(bind=True)
-def calculate_border_mdl_distance_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self,
-        MilitaryDemarcationLineDistanceCalculator,
-        year,
-        border_type_value,
-        BorderType,
-    )
+    Args:
+        results: Results of the border tasks, in `kinds` order
+        kinds: Border variable names of the tasks in the chord
 
+    Returns:
+        DataFrame with one row per border and the columns of every variable
+    """
+    if not results:
+        return {
+            "error": "No border variables to merge",
+            "details": "Failed during border merge",
+        }
 
-@celery_app.task(bind=True)
-def calculate_border_port_distance_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, PortDistanceCalculator, year, border_type_value, BorderType
+    errors = {
+        kind: result
+        for kind, result in zip(kinds, results)
+        if not isinstance(result, pd.DataFrame)
+    }
+    if errors:
+        return {
+            "error": f"Failed border variables: {', '.join(errors)}",
+            "details": errors,
+        }
+
+    # Outer merges rather than an index concat: some calculators can return a
+    # border code more than once, which concat refuses to align
+    border_cd = results[0].columns[0]
+    return reduce(
+        lambda left, right: left.merge(right, on=border_cd, how="outer"), results
     )
 
 
-@celery_app.task(bind=True)
-def calculate_border_rail_task(self, border_type_value: str, year: int):
-    return run_calculation(self, RailCalculator, year, border_type_value, BorderType)
+def _is_valid_border_year(calculator_class, border_type: BorderType, year: int) -> bool:
+    """Whether `calculator_class` accepts `year`, without touching the database."""
+    try:
+        return year in calculator_class(border_type, year).valid_years
+    except KeyError:
+        # RasterEmissionCalculator looks its source year up while initializing
+        return False
+
+
+def dispatch_all_border(border_type_value: str, year: int) -> AsyncResult:
+    """
+    Queue every border task valid for `year` as a chord merged into one frame.
+
+    The border tasks are independent and wait on different tables, so workers
+    run them concurrently and `merge_border_results` joins them once all have
+    finished.
+
+    Args:
+        border_type_value: Border type (`sgg`, `emd` or `jgg`)
+        year: Reference year for the calculation
+
+    Returns:
+        AsyncResult of the `merge_border_results` callback
+
+    Raises:
+        ValueError: If no border variable is available for `year`
+    """
+    border_type = BorderType(border_type_value)
+    kinds = [
+        kind
+        for kind, calculator_class in BORDER_CALCULATORS.items()
+        if _is_valid_border_year(calculator_class, border_type, year)
+    ]
+    if not kinds:
+        raise ValueError(f"No border variables are available for year {year}")
+    header = [
+        globals()[f"calculate_border_{kind}_task"].s(border_type_value, year)
+        for kind in kinds
+    ]
+    return chord(header)(merge_border_results.s(kinds))
+
+
+# --- Jgg centroid point tasks --- POINT
+
+# (task name, calculator class, buffer size enum) for every calculator that runs
+# over the jgg centroids with a buffer size and a year. One Celery task is
+# generated per entry as `calculate_jgg_{name}_task`. These tasks spend almost
+# all their time waiting on PostGIS, so they go to the `calculators` queue that
+# is consumed by the gevent worker (`kg-calculator-worker` in docker-compose).
+JGG_POINT_TASKS = [
+    ("bus_stop_count", BusStopCountCalculator, BufferSize),
+    ("rail_station_count", RailStationCountCalculator, BufferSize),
+    ("clinic_count", ClinicCountCalculator, BufferSize),
+    ("hospital_count", HospitalCountCalculator, BufferSize),
+    ("business_registration_count", BusinessRegistrationCountCalculator, BufferSize),
+    ("business_employee_count", BusinessEmployeeCountCalculator, BufferSize),
+    ("house_type_count", HouseTypeCountCalculator, BufferSize),
+    ("emission_vector", EmissionVectorBasedCalculator, EmissionBufferSize),
+    ("road_length", RoadLengthCalculator, BufferSize),
+    ("road_length_lane", RoadLengthLaneCalculator, BufferSize),
+    ("road_length_lane_width", RoadLengthLaneWidthCalculator, BufferSize),
+    ("mr1_length", Mr1LengthCalculator, BufferSize),
+    ("mr2_length", Mr2LengthCalculator, BufferSize),
+    ("mr1_length_lane", Mr1LengthLaneCalculator, BufferSize),
+    ("mr2_length_lane", Mr2LengthLaneCalculator, BufferSize),
+    ("mr1_length_lane_width", Mr1LengthLaneWidthCalculator, BufferSize),
+    ("mr2_length_lane_width", Mr2LengthLaneWidthCalculator, BufferSize),
+    ("population", PopulationCalculator, BufferSize),
+    ("ndvi_mean", NdviStatisticMeanCalculator, BufferSize),
+    ("ndvi_median", NdviStatisticMedianCalculator, BufferSize),
+    ("ndvi_min", NdviStatisticMinCalculator, BufferSize),
+    ("ndvi_max", NdviStatisticMaxCalculator, BufferSize),
+    ("ndvi_8mdn", NdviStatistic8mdnCalculator, BufferSize),
+    ("landuse", LanduseCalculator, BufferSize),
+]
+
+
+def _make_jgg_point_task(name, calculator_class, identifier_enum):
+    """Register a Celery task running `calculator_class` for a buffer size and year."""
+
+    @celery_app.task(
+        bind=True, name=f"tasks.calculate_jgg_{name}_task", queue="calculators"
+    )
+    def _task(self, buffer_size_value: int, year: int):
+        return run_calculation(
+            self, calculator_class, year, buffer_size_value, identifier_enum
+        )
 
+    return _task
 
-@celery_app.task(bind=True)
-def calculate_border_road_task(self, border_type_value: str, year: int):
-    return run_calculation(self, RoadCalculator, year, border_type_value, BorderType)
 
-
-@celery_app.task(bind=True)
-def calculate_border_topographic_model_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, TopographicModelCalculator, year, border_type_value, BorderType
+for _name, _calculator_class, _identifier_enum in JGG_POINT_TASKS:
+    globals()[f"calculate_jgg_{_name}_task"] = _make_jgg_point_task(
+        _name, _calculator_class, _identifier_enum
     )
 
 
-@celery_app.task(bind=True)
-def calculate_border_raster_emission_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, RasterEmissionCalculator, year, border_type_value, BorderType
-    )
+def dispatch_all_point(buffer_size_value: int, year: int) -> GroupResult:
+    """
+    Queue every jgg point task that accepts `buffer_size_value` in one publish.
 
+    The tasks are sent as a single Celery group instead of one `.delay()` round
+    trip to the broker per task.
 
-@celery_app.task(bind=True)
-def calculate_border_clinic_count_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, ClinicBorderCalculator, year, border_type_value, BorderType
-    )
-
+    Args:
+        buffer_size_value: Buffer size in meters
+        year: Reference year for the calculation
 
-@celery_app.task(bind=True)
-def calculate_border_hospital_count_task(self, border_type_value: str, year: int):
-    return run_calculation(
-        self, HospitalBorderCalculator, year, border_type_value, BorderType
-    )
+    Returns:
+        GroupResult whose children are in `JGG_POINT_TASKS` order
+    """
+    signatures = [
+        globals()[f"calculate_jgg_{name}_task"].s(buffer_size_value, year)
+        for name, _, identifier_enum in JGG_POINT_TASKS
+        if buffer_size_value in {member.value for member in identifier_enum}
+    ]
+    return group(signatures).apply_async()
 
 
 def run_point_calculation(
@@ -169,8 +417,7 @@ def run_point_calculation(
             calc = calculator_class(buffer_size, year, coordinates, srid)
         else:
             calc = calculator_class(year, coordinates, srid)
-        df = calc.calculate()
-        return df_to_json(df)
+        return calc.records()
     except Exception as e:
         self.update_state(
             state="FAILURE", meta={"exc_type": type(e).__name__, "exc_message": str(e)}
@@ -181,7 +428,12 @@ def run_point_calculation(
         }
 
 
-@celery_app.task(bind=True)
+# The custom-point and CSV tasks below wait on PostGIS and Supabase for almost
+# all of their run time, so they go to the `point_io` queue served by a gevent
+# worker (see docker-compose.yml).
+
+
+@celery_app.task(bind=True, queue="point_io")
 def calculate_point_bus_stop_count_task(
     self,
     coordinates: list[list[float]],
@@ -198,7 +450,7 @@ def calculate_point_bus_stop_count_task(
     )
 
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, queue="point_io")
 def calculate_point_hospital_count_task(
     self,
     coordinates: list[list[float]],
@@ -215,7 +467,110 @@ def calculate_point_hospital_count_task(
     )
 
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, queue="point_io")
+def calculate_point_airport_distance_task(
+    self,
+    coordinates: list[list[float]],
+    year: int,
+    srid: int = 4326,
+):
+    """Calculate the distance to the nearest airport for given coordinates.
+
+    Nearest airports are matched in process against a cached STRtree, so the
+    whole request is handled serially inside this one task; coordinates are
+    processed in batches only to report progress.
+    """
+    try:
+        batch_size = POINT_DISTANCE_BATCH_SIZE
+        total = len(coordinates)
+        final_records = []
+        last_progress = float("-inf")
+
+        for i in range(0, total, batch_size):
+            batch_coords = [
+                (coord[0], coord[1]) for coord in coordinates[i : i + batch_size]
+            ]
+
+            last_progress = _report_progress(
+                self,
+                last_progress,
+                {
+                    "current": i,
+                    "total": total,
+                    "status": f"Processing point {i + 1} of {total}",
+                },
+            )
+
+            calc = CustomAirportDistanceCalculator(
+                year, batch_coords, srid, first_point_id=i + 1
+            )
+            final_records.extend(calc.records())
+
+        return final_records
+    except Exception as e:
+        self.update_state(
+            state="FAILURE", meta={"exc_type": type(e).__name__, "exc_message": str(e)}
+        )
+        return {
+            "error": str(e),
+            "details": f"Failed during {CustomAirportDistanceCalculator.__name__}",
+        }
+
+
+# CSV `calculator_type` to calculator. Buffer count calculators take the request's
+# buffer size; distance calculators ignore it.
+CSV_CALCULATORS = {
+    "bus_stop": CustomBusStopCountCalculator,
+    "hospital": CustomHospitalCountCalculator,
+    "airport": CustomAirportDistanceCalculator,
+}
+
+
+def _make_csv_calculator(
+    calculator_type: str, buffer_size_value: int, year: int, srid: int
+):
+    """Return a function building the CSV calculator for one batch of coordinates.
+
+    The function takes the batch and the `point_id` of its first coordinate.
+    """
+    if calculator_type not in CSV_CALCULATORS:
+        raise ValueError(f"Unknown calculator type: {calculator_type}")
+    calculator_class = CSV_CALCULATORS[calculator_type]
+
+    if issubclass(calculator_class, CustomPointBufferCountCalculator):
+        buffer_size = BufferSize(buffer_size_value)
+        return lambda coordinates, first_point_id: calculator_class(
+            buffer_size, year, coordinates, srid, first_point_id
+        )
+    return lambda coordinates, first_point_id: calculator_class(
+        year, coordinates, srid, first_point_id
+    )
+
+
+@celery_app.task(queue="point_io")
+def calculate_csv_chunk_task(
+    xs: list[float],
+    ys: list[float],
+    calculator_type: str,
+    buffer_size_value: int,
+    year: int,
+    srid: int,
+    first_point_id: int,
+):
+    """Calculate one chunk of a CSV split up by the direct-upload task."""
+    make_calculator = _make_csv_calculator(
+        calculator_type, buffer_size_value, year, srid
+    )
+    return make_calculator(list(zip(xs, ys)), first_point_id).records()
+
+
+@celery_app.task(queue="point_io")
+def merge_csv_records(results: list[list[dict]]):
+    """Concatenate the chunk results of a split CSV in point order."""
+    return [record for records in results for record in records]
+
+
+@celery_app.task(bind=True, queue="point_io")
 def calculate_csv_file_task(
     self,
     file_id: str,
@@ -225,6 +580,9 @@ def calculate_csv_file_task(
     srid: int = 4326,
 ):
     """Process entire CSV file for point-based calculations."""
+    # Only this task talks to Supabase; importing the client here keeps it out
+    # of the startup cost of workers that only run calculators.
+    from supabase import create_client
 
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_ANON_KEY")
@@ -246,47 +604,61 @@ def calculate_csv_file_task(
 
         file_info = file_response.data
 
-        file_data = supabase.storage.from_("csv_files").download(file_info["file_path"])
-
-        csv_content = io.StringIO(file_data.decode("utf-8"))
-        df = pd.read_csv(csv_content)
-
-        coordinates = [(row["x"], row["y"]) for _, row in df.iterrows()]
-
-        if calculator_type == "bus_stop":
-            calculator_class = CustomBusStopCountCalculator
-        elif calculator_type == "hospital":
-            calculator_class = CustomHospitalCountCalculator
-        else:
-            raise ValueError(f"Unknown calculator type: {calculator_type}")
-
-        buffer_size = BufferSize(buffer_size_value)
-
-        batch_size = 100
-        total_batches = len(coordinates) // batch_size + (
-            1 if len(coordinates) % batch_size else 0
+        make_calculator = _make_csv_calculator(
+            calculator_type, buffer_size_value, year, srid
         )
-        all_results = []
-
-        for i in range(0, len(coordinates), batch_size):
-            batch_coords = coordinates[i : i + batch_size]
-            batch_num = i // batch_size + 1
-
-            self.update_state(
-                state="PROGRESS",
-                meta={
-                    "current": batch_num,
-                    "total": total_batches,
-                    "status": f"Processing batch {batch_num} of {total_batches}",
-                },
-            )
-
-            calc = calculator_class(buffer_size, year, batch_coords, srid)
-            batch_results = calc.calculate()
-            all_results.append(batch_results)
 
-        final_df = pd.concat(all_results, ignore_index=True)
-        return df_to_json(final_df)
+        # Stream the file from a signed URL and parse one batch at a time, so the
+        # first batch is calculated while the rest of the file is still arriving
+        signed_url = supabase.storage.from_("csv_files").create_signed_url(
+            file_info["file_path"], CSV_SIGNED_URL_EXPIRES_IN
+        )["signedURL"]
+
+        batch_size = CSV_BATCH_SIZE
+        final_records = []
+        last_progress = float("-inf")
+        points_done = 0
+
+        with http_session.get(signed_url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+
+            with pd.read_csv(
+                response.raw,
+                chunksize=batch_size,
+                usecols=["x", "y"],
+                dtype={"x": "float64", "y": "float64"},
+            ) as reader:
+                batch_num = 0
+                while True:
+                    try:
+                        batch_df = reader.get_chunk(batch_size)
+                    except StopIteration:
+                        break
+                    batch_num += 1
+                    batch_coords = list(
+                        zip(batch_df["x"].tolist(), batch_df["y"].tolist())
+                    )
+
+                    last_progress = _report_progress(
+                        self,
+                        last_progress,
+                        {
+                            "current": batch_num,
+                            "total": None,
+                            "status": f"Processing batch {batch_num}",
+                        },
+                    )
+
+                    started = time.perf_counter()
+                    calc = make_calculator(batch_coords, points_done + 1)
+                    final_records.extend(calc.records())
+                    points_done += len(batch_coords)
+                    batch_size = _next_csv_batch_size(
+                        batch_size, time.perf_counter() - started
+                    )
+
+        return final_records
 
     except Exception as e:
         self.update_state(
@@ -298,7 +670,7 @@ def calculate_csv_file_task(
         }
 
 
-@celery_app.task(bind=True)
+@celery_app.task(bind=True, queue="point_io")
 def calculate_csv_file_task_direct_upload(
     self,
     file_data: bytes,
@@ -310,46 +682,80 @@ def calculate_csv_file_task_direct_upload(
     """Process entire CSV file for point-based calculations."""
 
     try:
-        csv_content = io.StringIO(file_data.decode("utf-8"))
-        df = pd.read_csv(csv_content)
-
-        coordinates = [(row["x"], row["y"]) for _, row in df.iterrows()]
-
-        if calculator_type == "bus_stop":
-            calculator_class = CustomBusStopCountCalculator
-        elif calculator_type == "hospital":
-            calculator_class = CustomHospitalCountCalculator
-        else:
-            raise ValueError(f"Unknown calculator type: {calculator_type}")
+        # Only the coordinates are used; typing them up front skips dtype
+        # inference and never materializes the file's other columns
+        df = pd.read_csv(
+            io.BytesIO(file_data),
+            usecols=["x", "y"],
+            dtype={"x": "float64", "y": "float64"},
+            engine=CSV_PARSER_ENGINE,
+        )
 
-        buffer_size = BufferSize(buffer_size_value)
+        xs = df["x"].to_numpy(dtype="float64")
+        ys = df["y"].to_numpy(dtype="float64")
 
-        batch_size = 100
-        total_batches = len(coordinates) // batch_size + (
-            1 if len(coordinates) % batch_size else 0
+        make_calculator = _make_csv_calculator(
+            calculator_type, buffer_size_value, year, srid
         )
-        all_results = []
-
-        for i in range(0, len(coordinates), batch_size):
-            batch_coords = coordinates[i : i + batch_size]
-            batch_num = i // batch_size + 1
 
+        total = len(xs)
+        if total > CSV_FANOUT_MIN_POINTS:
+            # Large files are calculated by several workers at once. The chord
+            # takes over this task's id, so /job_status/ returns the merged rows.
+            header = [
+                calculate_csv_chunk_task.s(
+                    xs[i : i + CSV_FANOUT_CHUNK_SIZE].tolist(),
+                    ys[i : i + CSV_FANOUT_CHUNK_SIZE].tolist(),
+                    calculator_type,
+                    buffer_size_value,
+                    year,
+                    srid,
+                    i + 1,
+                )
+                for i in range(0, total, CSV_FANOUT_CHUNK_SIZE)
+            ]
             self.update_state(
                 state="PROGRESS",
                 meta={
-                    "current": batch_num,
-                    "total": total_batches,
-                    "status": f"Processing batch {batch_num} of {total_batches}",
+                    "current": 0,
+                    "total": total,
+                    "status": f"Processing {len(header)} chunks in parallel",
+                },
+            )
+            return self.replace(chord(header, merge_csv_records.s()))
+
+        batch_size = CSV_BATCH_SIZE
+        final_records = []
+        last_progress = float("-inf")
+
+        i = 0
+        while i < total:
+            batch_coords = list(
+                zip(xs[i : i + batch_size].tolist(), ys[i : i + batch_size].tolist())
+            )
+
+            # Batch sizes adapt as the task runs, so progress is counted in points
+            last_progress = _report_progress(
+                self,
+                last_progress,
+                {
+                    "current": i,
+                    "total": total,
+                    "status": f"Processing point {i + 1} of {total}",
                 },
             )
 
-            calc = calculator_class(buffer_size, year, batch_coords, srid)
-            batch_results = calc.calculate()
-            all_results.append(batch_results)
+            started = time.perf_counter()
+            calc = make_calculator(batch_coords, i + 1)
+            final_records.extend(calc.records())
+            i += len(batch_coords)
+            batch_size = _next_csv_batch_size(batch_size, time.perf_counter() - started)
 
-        final_df = pd.concat(all_results, ignore_index=True)
-        return df_to_json(final_df)
+        return final_records
 
+    except Ignore:
+        # Raised by self.replace once the chunks are queued
+        raise
     except Exception as e:
         self.update_state(
             state="FAILURE", meta={"exc_type": type(e).__name__, "exc_message": str(e)}
@@ -0,0 +1,49 @@
+import pytest
+import shapely
+from pyproj import Transformer
+
+from point_based_calculations import CustomAirportDistanceCalculator
+
+AIRPORTS = [shapely.Point(1000000, 2000000), shapely.Point(950000, 1950000)]
+
+
+def test_point_ids_start_at_first_point_id(features):
+    features(AIRPORTS)
+    coordinates = [(1000300, 2000400), (950000, 1950010)]
+
+    records = CustomAirportDistanceCalculator(
+        2020, coordinates, srid=5179, first_point_id=101
+    ).records()
+
+    assert [r["point_id"] for r in records] == [101, 102]
+    assert [(r["x"], r["y"]) for r in records] == coordinates
+    assert records[0]["D_Airport_2020"] == pytest.approx(500)
+    assert records[1]["D_Airport_2020"] == pytest.approx(10)
+
+
+def test_points_are_transformed_to_5179(features):
+    features(AIRPORTS)
+    lon, lat = 127.0, 37.5
+    x, y = Transformer.from_crs(4326, 5179, always_xy=True).transform(lon, lat)
+    expected = min(shapely.Point(x, y).distance(airport) for airport in AIRPORTS)
+
+    records = CustomAirportDistanceCalculator(2020, [(lon, lat)]).records()
+
+    assert records == [
+        {
+            "point_id": 1,
+            "x": lon,
+            "y": lat,
+            "D_Airport_2020": pytest.approx(expected),
+        }
+    ]
+
+
+def test_empty_table_gives_null_distances(features):
+    features([])
+
+    records = CustomAirportDistanceCalculator(
+        2020, [(1000000, 2000000), (0, 0)], srid=5179
+    ).records()
+
+    assert [r["D_Airport_2020"] for r in records] == [None, None]
@@ -0,0 +1,81 @@
+import pytest
+import shapely
+from celery.exceptions import Ignore
+
+import tasks
+
+CSV_DATA = b"x,y\n1,1\n2,2\n3,3\n4,4\n5,5\n"
+
+
+@pytest.fixture
+def csv_task(monkeypatch):
+    """The direct-upload CSV task with state updates discarded."""
+    task = tasks.calculate_csv_file_task_direct_upload
+    monkeypatch.setattr(task, "update_state", lambda **kwargs: None, raising=False)
+    monkeypatch.setattr(tasks, "CSV_FANOUT_CHUNK_SIZE", 2)
+    return task
+
+
+def test_next_csv_batch_size_doubles_fast_batches_up_to_max():
+    assert tasks._next_csv_batch_size(1000, 0.1) == 2000
+    assert (
+        tasks._next_csv_batch_size(tasks.CSV_MAX_BATCH_SIZE - 1, 0.1)
+        == tasks.CSV_MAX_BATCH_SIZE
+    )
+
+
+def test_next_csv_batch_size_halves_slow_batches_down_to_min():
+    assert tasks._next_csv_batch_size(4000, 10.0) == 2000
+    assert (
+        tasks._next_csv_batch_size(tasks.CSV_MIN_BATCH_SIZE + 1, 10.0)
+        == tasks.CSV_MIN_BATCH_SIZE
+    )
+
+
+def test_next_csv_batch_size_keeps_batches_within_target():
+    assert tasks._next_csv_batch_size(3000, tasks.CSV_BATCH_MIN_SECONDS) == 3000
+    assert tasks._next_csv_batch_size(3000, tasks.CSV_BATCH_MAX_SECONDS) == 3000
+
+
+def test_large_csv_is_fanned_out_to_a_chord(csv_task, monkeypatch):
+    monkeypatch.setattr(tasks, "CSV_FANOUT_MIN_POINTS", 3)
+    replaced = []
+
+    def replace(signature):
+        replaced.append(signature)
+        raise Ignore()
+
+    monkeypatch.setattr(csv_task, "replace", replace, raising=False)
+
+    with pytest.raises(Ignore):
+        csv_task.run(CSV_DATA, "airport", 300, 2020, 5179)
+
+    (signature,) = replaced
+    assert [s.args[0] for s in signature.tasks] == [[1.0, 2.0], [3.0, 4.0], [5.0]]
+    assert [s.args[-1] for s in signature.tasks] == [1, 3, 5]
+    assert signature.body.task == tasks.merge_csv_records.name
+
+
+def test_small_csv_is_calculated_in_process(csv_task, features, monkeypatch):
+    features([shapely.Point(0, 0)])
+    monkeypatch.setattr(tasks, "CSV_FANOUT_MIN_POINTS", 5)
+    # The chord must not be used below the threshold
+    monkeypatch.setattr(csv_task, "replace", pytest.fail, raising=False)
+
+    records = csv_task.run(CSV_DATA, "airport", 300, 2020, 5179)
+
+    assert [r["point_id"] for r in records] == [1, 2, 3, 4, 5]
+    assert records[2]["D_Airport_2020"] == pytest.approx(3 * 2**0.5)
+
+
+def test_merge_csv_records_keeps_chunk_order():
+    results = [
+        [{"point_id": 1}, {"point_id": 2}],
+        [],
+        [{"point_id": 3}],
+        [{"point_id": 4}, {"point_id": 5}],
+    ]
+
+    merged = tasks.merge_csv_records.run(results)
+
+    assert [r["point_id"] for r in merged] == [1, 2, 3, 4, 5]